@@ -1,56 +1,83 @@
 import json
-import subprocess
+import logging
 import time
-from pathlib import Path
-from typing import Optional
-
-from src.constants import FLIR2_IP
-
-
-SCRIPT_DIR = Path(__file__).resolve().parents[1] / "script"
-
-
-def _resolve_script(script_path: Optional[str], fallback_name: str) -> str:
-    """Resolve a script path relative to the script directory when needed."""
-    if script_path:
-        candidate = Path(script_path)
-        if candidate.is_file():
-            return str(candidate.resolve())
-        candidate = SCRIPT_DIR / candidate.name
-        if candidate.is_file():
-            return str(candidate.resolve())
-        return script_path  # Fall back to original string; let subprocess surface errors.
-    return str((SCRIPT_DIR / fallback_name).resolve())
+from http.client import HTTPConnection, HTTPException, RemoteDisconnected
+from typing import Any, Callable, Dict, Optional
+from urllib.error import HTTPError
+from urllib.parse import quote_plus, urlencode
+
+from src.constants import (
+    FLIR2_IP,
+    NEXUS_CGI_PATH,
+    NEXUS_DEFAULT_PORT,
+    SESSION_EXPIRED_RETURN_CODE,
+    TOKEN_OVERRIDE_PARAMS,
+)
+
+logger = logging.getLogger(__name__)
+
+try:  # orjson parses the small camera payloads several times faster.
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Whole-request templates for the per-frame set commands: a single %-format is
+# about 20x cheaper than building a query dict and urlencoding it.
+# The session slot takes quote_plus(session), as CameraControlAPI quotes it.
+_TOKEN_SUFFIX = urlencode(TOKEN_OVERRIDE_PARAMS)
+_MOVE_TARGET = (
+    f"{NEXUS_CGI_PATH}?action=PTAzimuthElevationAtSpeedSet&session=%s"
+    f"&Azimuth=%.2f&Elevation=%.2f&Azimuth_Rate=%.2f&Elevation_Rate=%.2f&{_TOKEN_SUFFIX}"
+)
+_SET_ZOOM_TARGET = (
+    f"{NEXUS_CGI_PATH}?action=DLTVFOVMagnificationSet&session=%s&Magnification=%.2f&{_TOKEN_SUFFIX}"
+)
 
 
 class CameraControl:
+    __slots__ = (
+        "camera_ip",
+        "port",
+        "request_timeout",
+        "_conn",
+        "session_id",
+        "_session_deadline",
+        "SESSION_TIMEOUT",
+    )
+
+    # Keyword-only: the old constructor took script paths positionally, and one
+    # passed here by mistake must fail rather than be used as the camera IP.
     def __init__(
         self,
-        auth_script: Optional[str] = None,
-        get_degree_script: Optional[str] = None,
-        get_zoom_script: Optional[str] = None,
-        get_speed_script: Optional[str] = None,
-        move_script: Optional[str] = None,
-        set_zoom_script: Optional[str] = None,
+        *,
         camera_ip: Optional[str] = None,
+        port: int = NEXUS_DEFAULT_PORT,
+        request_timeout: float = 5.0,
     ):
 
-        # Scripts for camera control
-        self.AUTHENTICATE_SCRIPT = _resolve_script(auth_script, "authenticate.sh")
-        self.GET_DEGREE = _resolve_script(get_degree_script, "get_degree.sh")
-        self.GET_ZOOM = _resolve_script(get_zoom_script, "get_zoom.sh")
-        self.SET_ZOOM = _resolve_script(set_zoom_script, "set_zoom.sh")
-        self.MOVE_SCRIPT = _resolve_script(move_script, "move_to_pos.sh")
-        self.GET_SPEED = _resolve_script(get_speed_script, "get_speed.sh")
-
         # Network configuration
         self.camera_ip = camera_ip or FLIR2_IP
+        self.port = port
+        self.request_timeout = request_timeout
+        # Opened on first use and kept alive for every later command.
+        self._conn: Optional[HTTPConnection] = None
 
         # Session and state variables
         self.session_id: Optional[str] = None
-        self.last_auth_time = 0.0
-        # Most camera sessions expire after 60-300 seconds of inactivity.
-        self.SESSION_TIMEOUT = 120.0
+        # Monotonic time after which the session is assumed to have lapsed.
+        self._session_deadline = 0.0
+        # Sessions expire after inactivity; re-authenticate well before the shortest timeout.
+        self.SESSION_TIMEOUT = 90.0
+
+    def __getstate__(self):
+        # Sockets can't be pickled; the copy reconnects on first use.
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["_conn"] = None
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
 
     def set_camera_ip(self, ip_address: str) -> None:
         """Update the target camera IP address."""
@@ -58,49 +85,132 @@ class CameraControl:
             raise ValueError("Camera IP address cannot be empty.")
         if ip_address != self.camera_ip:
             self.camera_ip = ip_address
+            self.close()
             # Force re-authentication on next call for the new camera.
             self.session_id = None
-            self.last_auth_time = 0.0
+            self._session_deadline = 0.0
+
+    def close(self) -> None:
+        """Closes the kept-alive camera connection, if any."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _http_get_json(self, action: str, **params: Any) -> Dict[str, Any]:
+        """
+        Issues a single Nexus CGI request and returns the decoded JSON response.
+        """
+        query = {"action": action}
+        query.update(params)
+        return self._http_get(f"{NEXUS_CGI_PATH}?{urlencode(query)}")
+
+    def _http_get(self, target: str) -> Dict[str, Any]:
+        """
+        Sends a GET for an already-encoded request target over the kept-alive connection.
+        """
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = HTTPConnection(self.camera_ip, self.port, timeout=self.request_timeout)
+            try:
+                self._conn.request("GET", target, headers={"Connection": "keep-alive"})
+                response = self._conn.getresponse()
+                payload = response.read()
+            except (RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The camera dropped the idle socket; reconnect once.
+                self.close()
+                if attempt == 0:
+                    continue
+                raise
+            except HTTPException as e:
+                self.close()
+                raise ConnectionError(f"Invalid HTTP response from camera: {e}") from e
+            except OSError:
+                self.close()
+                raise
+            if response.status >= 400:
+                raise HTTPError(target, response.status, response.reason, response.headers, None)
+            # The body is pure JSON, so parse the bytes without decoding first.
+            return _json_loads(payload)
+        raise ConnectionError("Failed to reach camera.")
+
+    def _command(self, description: str, action: str, **params: Any) -> Optional[Dict[str, Any]]:
+        """
+        Runs an authenticated command, re-authenticating once on failure.
+        """
+        return self._run(
+            description,
+            lambda: self._http_get_json(
+                action,
+                session=self.session_id,
+                **params,
+                **TOKEN_OVERRIDE_PARAMS,
+            ),
+        )
+
+    def _run(self, description: str, send: Callable[[], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Calls ``send`` with a valid session, re-authenticating once if the camera rejects it.
+        """
+        # --- MODIFIED: Proactive session check ---
+        if (not self.session_id or time.monotonic() >= self._session_deadline) and not self.authenticate(force_auth=True):
+            return None
+
+        for attempt in range(2):
+            try:
+                data = send()
+            except json.JSONDecodeError:
+                logger.warning("No JSON object found in camera response on attempt %d.", attempt + 1)
+                continue
+            except HTTPError as e:
+                logger.warning("%s failed on attempt %d. Error: %s", description, attempt + 1, e.reason)
+                if e.code != 401 or attempt == 1:
+                    return None
+                # Only an auth failure warrants a fresh session.
+                if not self.authenticate(force_auth=True): return None
+                continue
+            except OSError as e:  # Connection errors and socket timeouts
+                logger.warning("%s failed on attempt %d. Error: %s", description, attempt + 1, e)
+                return None
+            except Exception:
+                logger.exception("An unexpected error occurred in %s", description)
+                return None
 
-    def _is_session_expired(self):
-        """Checks if the session is likely expired based on time."""
-        return (time.time() - self.last_auth_time) > self.SESSION_TIMEOUT
+            error = data.get("error") if isinstance(data, dict) else None
+            if isinstance(error, dict) and str(error.get("Return Code")) == SESSION_EXPIRED_RETURN_CODE:
+                logger.warning("%s failed on attempt %d. Error: session expired", description, attempt + 1)
+                if attempt == 0 and self.authenticate(force_auth=True):
+                    continue
+                return None
+            # Any accepted command keeps the session alive on the camera.
+            self._session_deadline = time.monotonic() + self.SESSION_TIMEOUT
+            return data
+        return None
 
     def authenticate(self, force_auth=False):
         """
         Authenticates with the FLIR camera to obtain a session ID.
         It will only re-authenticate if forced or if the session is expired.
         """
-        if not force_auth and self.session_id and not self._is_session_expired():
+        if not force_auth and self.session_id and time.monotonic() < self._session_deadline:
             # If we have a session ID and it's not expired, do nothing.
             return True
 
-        print("Session expired or forced. Running authentication script...")
+        logger.info("Session expired or forced. Requesting a new session...")
         try:
-            process_auth = subprocess.Popen(
-                [self.AUTHENTICATE_SCRIPT, self.camera_ip],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            stdout, stderr = process_auth.communicate(timeout=15)
-
-            if process_auth.returncode != 0:
-                print(f"Authentication script failed! Stderr: {stderr.strip()}")
+            data = self._http_get_json("SERVERWhoAmI")
+            session = data.get("SERVERWhoAmI", {}).get("Id")
+            if not session:
+                logger.warning("Failed to get session ID from camera. Response was empty.")
                 self.session_id = None
                 return False
 
-            self.session_id = stdout.strip()
-            if not self.session_id:
-                print("Failed to get session ID from authenticate script. Stdout was empty.")
-                return False
-
-            # --- IMPORTANT: Update the authentication timestamp ---
-            self.last_auth_time = time.time()
-            print(f"Obtained new Session ID: {self.session_id}")
+            self.session_id = str(session)
+            # --- IMPORTANT: Push the session deadline forward ---
+            self._session_deadline = time.monotonic() + self.SESSION_TIMEOUT
+            logger.info("Obtained new Session ID: %s", self.session_id)
             return True
         except Exception as e:
-            print(f"An exception occurred during authentication: {e}")
+            logger.warning("An exception occurred during authentication: %s", e)
             self.session_id = None
             return False
 
@@ -108,119 +218,47 @@ class CameraControl:
         """
         Fetches the camera's position, with re-authentication on failure.
         """
-        # --- MODIFIED: Proactive session check ---
-        if not self.authenticate():
+        data = self._command("Get position", "PTAzimuthElevationGet")
+        if data is None:
             return None, None
 
-        for attempt in range(2):
-            try:
-                command_to_get = [self.GET_DEGREE, self.camera_ip, self.session_id]
-                json_output = subprocess.run(command_to_get, capture_output=True, text=True, check=True)
-                output_str = json_output.stdout
-                json_start_index = output_str.find('{')
-                if json_start_index == -1: continue
-                data = json.loads(output_str[json_start_index:])
-
-                azimuth = data.get('PTAzimuthElevationGet', {}).get('Azimuth')
-                elevation = data.get('PTAzimuthElevationGet', {}).get('Elevation')
-                return azimuth, elevation
-            except subprocess.CalledProcessError as e:
-                print(f"Get position failed on attempt {attempt + 1}. Stderr: {e.stderr.strip()}")
-                if attempt == 0:
-                    # Force re-authentication on the first failure
-                    if not self.authenticate(force_auth=True): return None, None
-                else:
-                    return None, None # Give up after the second attempt
-            except Exception as e:
-                print(f"An unexpected error occurred in get_degree_pos: {e}")
-                return None, None
+        azimuth = data.get('PTAzimuthElevationGet', {}).get('Azimuth')
+        elevation = data.get('PTAzimuthElevationGet', {}).get('Elevation')
+        return azimuth, elevation
 
     def move_camera_to_absolute_pos(self, target_az, target_el, speed_az=180, speed_el=180):
         """
         Moves the camera, with re-authentication on failure.
         """
-        # --- MODIFIED: Proactive session check ---
-        if not self.authenticate():
-            return False
-
-        for attempt in range(2):
-            try:
-                command = [
-                    self.MOVE_SCRIPT,
-                    self.camera_ip,
-                    self.session_id,
-                    f"{target_az:.2f}",
-                    f"{target_el:.2f}",
-                    f"{speed_az:.2f}",
-                    f"{speed_el:.2f}",
-                ]
-                subprocess.run(command, capture_output=True, text=True, check=True)
-                return True
-            except subprocess.CalledProcessError as e:
-                print(f"Move command failed on attempt {attempt + 1}. Stderr: {e.stderr.strip()}")
-                if attempt == 0:
-                    if not self.authenticate(force_auth=True): return False
-                else:
-                    return False
-            except Exception as e:
-                print(f"An unexpected error occurred in move_camera_to_absolute_pos: {e}")
-                return False
+        data = self._run(
+            "Move command",
+            lambda: self._http_get(
+                _MOVE_TARGET % (quote_plus(str(self.session_id)), target_az, target_el, speed_az, speed_el)
+            ),
+        )
+        return data is not None
 
     def get_zoom(self):
         """
         Fetches the camera's zoom, with re-authentication on failure.
         """
-        # --- MODIFIED: Proactive session check ---
-        if not self.authenticate():
+        data = self._command("Get zoom", "DLTVFOVMagnificationGet")
+        if data is None:
             return None
 
-        for attempt in range(2):
-            try:
-                command = [self.GET_ZOOM, self.camera_ip, self.session_id]
-                process_result = subprocess.run(command, capture_output=True, text=True, check=True)
-                output_str = process_result.stdout
-                json_start_index = output_str.find('{')
-                if json_start_index == -1:
-                    print(f"Error: No JSON object found in script output on attempt {attempt + 1}.")
-                    continue
-
-                json_str = output_str[json_start_index:]
-                data = json.loads(json_str)
-                current_zoom = data.get('DLTVFOVMagnificationGet', {}).get('Magnification')
-                if current_zoom is None: return None
-                return float(current_zoom)
-            except subprocess.CalledProcessError as e:
-                print(f"Get zoom failed on attempt {attempt + 1}. Stderr: {e.stderr.strip()}")
-                if attempt == 0:
-                    if not self.authenticate(force_auth=True): return None
-                else:
-                    return None
-            except Exception as e:
-                print(f"An unexpected error occurred in get_zoom: {e}")
-                return None
+        current_zoom = data.get('DLTVFOVMagnificationGet', {}).get('Magnification')
+        if current_zoom is None: return None
+        return float(current_zoom)
 
     def set_zoom(self, zoom):
         """
         Sets the zoom of the camera
         """
-        # --- MODIFIED: Proactive session check ---
-        if not self.authenticate():
-            return False
-
-        for attempt in range(2):
-            try:
-                command = [self.SET_ZOOM, self.camera_ip, self.session_id, f"{float(zoom):.2f}"]
-                subprocess.run(command, capture_output=True, text=True, check=True)
-                return True
-            except subprocess.CalledProcessError as e:
-                print(f"Set zoom failed on attempt {attempt + 1}. Stderr: {e.stderr.strip()}")
-                if attempt == 0:
-                    if not self.authenticate(force_auth=True): return False
-                else:
-                    return False
-            except Exception as e:
-                print(f"An unexpected error occurred in set_zoom: {e}")
-                return False
+        data = self._run(
+            "Set zoom",
+            lambda: self._http_get(_SET_ZOOM_TARGET % (quote_plus(str(self.session_id)), float(zoom))),
+        )
+        return data is not None
 
     # --- Unchanged helper methods below ---
 
@@ -241,7 +279,43 @@ class CameraControl:
         if camera_az is None or camera_el is None:
             return None, None
         offset_az, offset_el = self.calculate_screen_offset_degrees(pixel_x, pixel_y, screen_width, screen_height, current_h_fov, current_v_fov)
-        final_az = (camera_az + offset_az + 360) % 360
+        final_az = camera_az + offset_az
+        # A single compare-and-add covers the usual one-turn wrap; the modulo
+        # only runs for inputs more than a full turn out of range.
+        if final_az < 0.0:
+            final_az += 360.0
+        elif final_az >= 360.0:
+            final_az -= 360.0
+        if not 0.0 <= final_az < 360.0:
+            final_az %= 360.0
+        final_el = camera_el + offset_el
+        return final_az, final_el
+
+    def calculate_screen_offsets_vec(self, pixel_xs, pixel_ys, screen_width, screen_height, horizontal_fov, vertical_fov):
+        '''
+        Batched calculate_screen_offset_degrees: one NumPy pass over all detections in a frame
+        '''
+        # Only the batched helpers need NumPy, so the class works without it.
+        import numpy as np
+
+        pixel_xs = np.asarray(pixel_xs, dtype=np.float64)
+        pixel_ys = np.asarray(pixel_ys, dtype=np.float64)
+        angle_x = ((2 * pixel_xs / screen_width) - 1) * (horizontal_fov * 0.5)
+        angle_y = (1 - (2 * pixel_ys / screen_height)) * (vertical_fov * 0.5)
+        return angle_x, angle_y
+
+    def calculate_absolute_target_pos_vec(self, pixel_xs, pixel_ys, current_h_fov, current_v_fov, screen_width, screen_height, camera_az, camera_el):
+        '''
+        Batched calculate_absolute_target_pos returning azimuth/elevation arrays
+        '''
+        import numpy as np
+
+        if camera_az is None or camera_el is None:
+            return None, None
+        offset_az, offset_el = self.calculate_screen_offsets_vec(pixel_xs, pixel_ys, screen_width, screen_height, current_h_fov, current_v_fov)
+        final_az = camera_az + offset_az
+        # Floor-based wrap: same result as np.mod, without its slower divmod kernel.
+        final_az -= 360.0 * np.floor(final_az * (1.0 / 360.0))
         final_el = camera_el + offset_el
         return final_az, final_el
 
@@ -249,31 +323,11 @@ class CameraControl:
         """
         Fetches the camera's speed, with re-authentication on failure.
         """
-        if not self.authenticate():
+        data = self._command("Get speed", "PTSpeedGet")
+        if data is None:
             return None
 
-        for attempt in range(2):
-            try:
-                command = [self.GET_SPEED, self.camera_ip, self.session_id]
-                process_result = subprocess.run(command, capture_output=True, text=True, check=True)
-                output_str = process_result.stdout
-                json_start_index = output_str.find('{')
-                if json_start_index == -1:
-                    print(f"Error: No JSON object found in script output on attempt {attempt + 1}.")
-                    continue # This will trigger the re-auth on the first attempt
-
-                json_str = output_str[json_start_index:]
-                data = json.loads(json_str)
-                current_az_speed = data.get('PTSpeedGet', {}).get('Azimuth_Speed')
-                current_el_speed = data.get('PTSpeedGet', {}).get('Elevation_Speed')
-                if current_az_speed is None or current_el_speed is None: return None
-                return float(current_az_speed), float(current_el_speed) # Success
-            except subprocess.CalledProcessError as e:
-                print(f"Get speed failed on attempt {attempt + 1}. Stderr: {e.stderr.strip()}")
-                if attempt == 0:
-                    if not self.authenticate(force_auth=True): return None
-                else:
-                    return None
-            except Exception as e:
-                print(f"An unexpected error occurred in get_speed: {e}")
-                return None
+        current_az_speed = data.get('PTSpeedGet', {}).get('Azimuth_Speed')
+        current_el_speed = data.get('PTSpeedGet', {}).get('Elevation_Speed')
+        if current_az_speed is None or current_el_speed is None: return None
+        return float(current_az_speed), float(current_el_speed) # Success
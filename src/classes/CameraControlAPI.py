@@ -1,46 +1,285 @@
-import json
+import logging
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import quote_plus, urlencode
 
-from src.constants import CAMERA_HOSTS, DEFAULT_CAMERA, NEXUS_CGI_PATH, NEXUS_DEFAULT_PORT
+from src.constants import (
+    COMMAND_SPECS,
+    DEFAULT_CAMERA,
+    NEXUS_CGI_PATH,
+    NEXUS_DEFAULT_PORT,
+    SESSION_EXPIRED_RETURN_CODE,
+    TOKEN_OVERRIDE_PARAMS,
+)
 from src.script import camera_control
+from src.script.camera_control import POOL_SIZE, ConnectionPool, send_request, shared_pool
 
+logger = logging.getLogger(__name__)
 
-class CameraControlAPI:
+# Heartbeats only keep a session warm while it has been used this recently.
+HEARTBEAT_IDLE_LIMIT = 300.0
+
+
+# Request targets are a per-session prefix (path, session and token params,
+# built once per authentication) followed by a per-command query suffix.
+NO_SESSION_PREFIX = f"{NEXUS_CGI_PATH}?{urlencode(TOKEN_OVERRIDE_PARAMS)}"
+
+
+def session_url_prefix(session: Any) -> str:
+    return f"{NEXUS_CGI_PATH}?session={quote_plus(str(session))}&{urlencode(TOKEN_OVERRIDE_PARAMS)}"
+
+
+# Pre-baked query suffixes for commands without dynamic parameters.
+STATIC_COMMAND_SUFFIXES: Dict[str, str] = {
+    name: "&" + urlencode({"action": spec.action, **spec.static_params})
+    for name, spec in COMMAND_SPECS.items()
+    if not spec.params
+}
+
+
+def _escape(encoded: str) -> str:
+    # Percent-escapes from urlencode must survive the later %-format.
+    return encoded.replace("%", "%%")
+
+
+# Per-command %-templates for the parameterised commands: the action and
+# static params are encoded once, leaving one slot per value, filled by the
+# matching (name, coercer) pair.
+COMMAND_TEMPLATES: Dict[str, Tuple[str, Tuple[Tuple[str, Callable[[str, str], str]], ...]]] = {
+    name: (
+        "&"
+        + _escape(urlencode({"action": spec.action, **spec.static_params}))
+        + "".join(f"&{_escape(quote_plus(param.name))}=%s" for param in spec.params),
+        tuple((param.name, camera_control.coercer_for(param)) for param in spec.params),
+    )
+    for name, spec in COMMAND_SPECS.items()
+    if spec.params
+}
+
+
+class SessionExpiredError(RuntimeError):
+    """The camera answered HTTP 401 for the current session."""
+
+
+@dataclass
+class CameraSnapshot:
+    position: Optional[Tuple[float, float]]
+    zoom: Optional[float]
+    speed: Optional[Tuple[float, float]]
+
+
+def _coerce_command_params(
+    command_name: str, params: Dict[str, Any]
+) -> Tuple[camera_control.ParsedCommand, Dict[str, str]]:
+    parsed_command = camera_control.load_command(command_name)
+    spec_by_name = parsed_command.spec_by_name
+
+    extras = [name for name in params if name not in spec_by_name]
+    if extras:
+        extras_str = ", ".join(sorted(extras))
+        raise ValueError(
+            f"Unexpected parameter(s) for '{command_name}': {extras_str}."
+        )
+
+    coercers = parsed_command.coercers
+    coerced: Dict[str, str] = {name: coercers[name](name, str(value)) for name, value in params.items()}
+    # Only omitted params need a second look, for defaults and required ones.
+    if len(coerced) < len(spec_by_name):
+        for spec in parsed_command.param_specs:
+            if spec.name in coerced:
+                continue
+            if spec.default is not None:
+                coerced[spec.name] = str(spec.default)
+            elif spec.required:
+                raise ValueError(
+                    f"Missing required parameter '{spec.name}' for command '{command_name}'."
+                )
+    return parsed_command, coerced
+
+
+def build_command_suffix(command_name: str, params: Dict[str, Any]) -> str:
+    """Build the session-independent ``&action=...`` part of a request target."""
+    compiled = COMMAND_TEMPLATES.get(command_name)
+    if compiled is not None:
+        template, slots = compiled
+        # Calls that pass exactly the declared params skip the generic query
+        # dict; defaults, unknown commands and bad names take the slow path.
+        if len(params) == len(slots) and all(name in params for name, _ in slots):
+            values = tuple(quote_plus(coerce(name, str(params[name]))) for name, coerce in slots)
+            return template % values
+    parsed_command, coerced = _coerce_command_params(command_name, params)
+    return "&" + urlencode({"action": parsed_command.action, **parsed_command.static_params, **coerced})
+
+
+def is_session_rejected(result: Dict[str, Any]) -> bool:
+    """Return True when a command response reports the session as expired."""
+    error = result.get("error")
+    return isinstance(error, dict) and str(error.get("Return Code")) == SESSION_EXPIRED_RETURN_CODE
+
+
+# Response parsing shared by CameraControlAPI and CameraControlAsync, which
+# differ only in how the requests are sent.
+def parse_session_id(data: Dict[str, Any]) -> Any:
+    """Return the session id from a SERVERWhoAmI response, or raise ValueError."""
+    if "raw" in data:
+        raise ValueError("invalid JSON in response.")
+    session = data.get("SERVERWhoAmI", {}).get("Id")
+    if not session:
+        raise ValueError("session ID missing in response.")
+    return session
+
+
+def parse_zoom(result: Dict[str, Any]) -> Optional[float]:
+    payload = result.get("DLTVFOVMagnificationGet")
+    if not payload:
+        return None
+    magnification = payload.get("Magnification")
+    return float(magnification) if magnification is not None else None
+
+
+def parse_speed(result: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    payload = result.get("PTSpeedGet")
+    if not payload:
+        return None
+    az_speed = payload.get("Azimuth_Speed")
+    el_speed = payload.get("Elevation_Speed")
+    if az_speed is None or el_speed is None:
+        return None
+    return float(az_speed), float(el_speed)
+
+
+def parse_position(result: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    payload = result.get("PTAzimuthElevationGet")
+    if not payload:
+        return None
+    azimuth = payload.get("Azimuth")
+    elevation = payload.get("Elevation")
+    if azimuth is None or elevation is None:
+        return None
+    return float(azimuth), float(elevation)
+
+
+class SessionState:
+    """Session bookkeeping shared by the sync and asyncio clients.
+
+    Subclasses provide the ``session_id``, ``session_timeout``,
+    ``_session_deadline`` and ``_url_prefix`` slots and do the I/O.
+    """
+
+    __slots__ = ()
+
+    def invalidate_session(self) -> None:
+        """Force the next command to re-authenticate (the connection is kept)."""
+        self.session_id = None
+        self._session_deadline = 0.0
+        self._url_prefix = NO_SESSION_PREFIX
+
+    def _start_session(self, session: Any) -> None:
+        self.session_id = session
+        self._url_prefix = session_url_prefix(session)
+        self._session_deadline = time.monotonic() + self.session_timeout
+
+    def _accept(self, result: Optional[Dict[str, Any]]) -> bool:
+        """True if the camera answered with the session it was sent."""
+        if result is None or is_session_rejected(result):
+            return False
+        # Any accepted command keeps the session alive on the camera.
+        self._session_deadline = time.monotonic() + self.session_timeout
+        return True
+
+
+def _heartbeat_tick(ref: "weakref.ReferenceType[CameraControlAPI]") -> None:
+    # Holds only a weak reference so a forgotten instance can still be collected.
+    api = ref()
+    if api is not None:
+        api._heartbeat()
+
+
+class CameraControlAPI(SessionState):
     """Python implementation that reuses the master command registry instead of shell scripts."""
 
+    __slots__ = (
+        "camera_alias",
+        "port",
+        "_host_override",
+        "_host_cached",
+        "session_timeout",
+        "request_timeout",
+        "session_id",
+        "_session_deadline",
+        "_url_prefix",
+        "_last_activity",
+        "heartbeat_interval",
+        "_auth_lock",
+        "_pool",
+        "_executor",
+        "_heartbeat_timer",
+        "_runtime_lock",
+        "__weakref__",
+    )
+    # Per-process resources that are recreated rather than pickled.
+    _RUNTIME_SLOTS = ("_auth_lock", "_pool", "_executor", "_heartbeat_timer", "_runtime_lock", "__weakref__")
+
     def __init__(
         self,
         camera_alias: str = DEFAULT_CAMERA,
         host: Optional[str] = None,
         port: int = NEXUS_DEFAULT_PORT,
-        session_timeout: float = 120.0,
+        session_timeout: float = 90.0,
         request_timeout: float = 5.0,
+        heartbeat_interval: Optional[float] = 60.0,
     ) -> None:
         self.camera_alias = camera_alias
         self.port = port
         self._host_override = host
+        # Resolved on first use; set_camera() clears it.
+        self._host_cached: Optional[str] = None
         self.session_timeout = session_timeout
         self.request_timeout = request_timeout
+        # Seconds between keep-alive pings while the camera is in use; None disables them.
+        self.heartbeat_interval = heartbeat_interval
 
         self.session_id: Optional[str] = None
-        self._last_auth = 0.0
+        # Monotonic time after which the session is assumed to have lapsed.
+        self._session_deadline = 0.0
+        self._url_prefix = NO_SESSION_PREFIX
+        self._last_activity = 0.0
+        self._init_runtime()
+
+    def _init_runtime(self) -> None:
+        self._auth_lock = threading.Lock()
+        # Looked up from the shared pools on first request; holding it keeps the pool alive.
+        self._pool: Optional[ConnectionPool] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._heartbeat_timer: Optional[threading.Timer] = None
+        # Orders close() against the heartbeat rescheduling itself and against
+        # snapshot() creating the executor.
+        self._runtime_lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if name not in self._RUNTIME_SLOTS
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._init_runtime()
 
     # ------------------------------------------------------------------
     # Host / session management helpers
     # ------------------------------------------------------------------
     @property
     def host(self) -> str:
-        if self._host_override:
-            return self._host_override
-        if self.camera_alias not in CAMERA_HOSTS:
-            available = ", ".join(sorted(CAMERA_HOSTS))
-            raise ValueError(
-                f"Unknown camera alias '{self.camera_alias}'. Known aliases: {available}"
-            )
-        return CAMERA_HOSTS[self.camera_alias]
+        if self._host_cached is None:
+            self._host_cached = camera_control.resolve_host(self._host_override, self.camera_alias)
+        return self._host_cached
 
     def set_camera(self, camera_alias: Optional[str] = None, host: Optional[str] = None) -> None:
         """Switch to a different camera alias or explicit host."""
@@ -48,138 +287,186 @@ class CameraControlAPI:
             self.camera_alias = camera_alias
         if host is not None:
             self._host_override = host
+        self._host_cached = None
+        self._pool = None
         self.invalidate_session()
 
-    def invalidate_session(self) -> None:
-        """Force the next command to re-authenticate."""
-        self.session_id = None
-        self._last_auth = 0.0
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Release the shared connection pool and stop the background workers.
 
-    def _session_expired(self) -> bool:
-        return (time.time() - self._last_auth) > self.session_timeout
+        The pool's sockets are closed once no other client of the camera holds it.
+        """
+        with self._runtime_lock:
+            timer, self._heartbeat_timer = self._heartbeat_timer, None
+        if timer is not None:
+            timer.cancel()
+        self._pool = None
+        with self._runtime_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
-    def _base_url(self) -> str:
-        return f"http://{self.host}:{self.port}{NEXUS_CGI_PATH}"
+    @classmethod
+    def close_shared_pools(cls) -> None:
+        """Close the idle connections of every shared pool, e.g. at process shutdown."""
+        camera_control.close_shared_pools()
+
+    def _connection_pool(self) -> ConnectionPool:
+        pool = self._pool
+        if pool is None:
+            pool = self._pool = shared_pool(self.host, self.port)
+        return pool
+
+    def _request(self, query: Dict[str, str]) -> Dict[str, Any]:
+        return self._get(f"{NEXUS_CGI_PATH}?{urlencode(query)}")
+
+    def _get(self, target: str) -> Dict[str, Any]:
+        """Send a GET over the shared connection pool and decode the response."""
+        status, reason, payload = send_request(
+            self._connection_pool(), "GET", target, self.request_timeout
+        )
+        if status == 401:
+            raise SessionExpiredError("HTTP error 401 from camera: session rejected")
+        if status >= 400:
+            raise RuntimeError(f"HTTP error {status} from camera: {reason}")
+        return camera_control.parse_response(payload)
 
     # ------------------------------------------------------------------
     # Authentication
     # ------------------------------------------------------------------
     def authenticate(self, force: bool = False) -> bool:
-        if not force and self.session_id and not self._session_expired():
+        if not force and self.session_id and time.monotonic() < self._session_deadline:
             return True
 
-        auth_url = f"{self._base_url()}?action=SERVERWhoAmI"
-        request = Request(auth_url)
-        try:
-            with urlopen(request, timeout=self.request_timeout) as response:
-                payload = response.read().decode("utf-8")
-        except (HTTPError, URLError) as exc:
-            print(f"Authentication failed: {exc}")
-            self.invalidate_session()
-            return False
+        with self._auth_lock:
+            return self._authenticate_locked(force)
 
-        try:
-            data = json.loads(payload)
-            session = data.get("SERVERWhoAmI", {}).get("Id")
-        except json.JSONDecodeError as exc:
-            print(f"Authentication failed: invalid JSON ({exc})")
-            self.invalidate_session()
-            return False
+    def _reauthenticate(self, rejected_session: Optional[str]) -> bool:
+        """Replace a session the camera rejected, unless another thread already has."""
+        with self._auth_lock:
+            if self.session_id and self.session_id != rejected_session:
+                return True
+            return self._authenticate_locked(force=True)
+
+    def _authenticate_locked(self, force: bool) -> bool:
+        # Another thread may have refreshed the session while we waited.
+        if not force and self.session_id and time.monotonic() < self._session_deadline:
+            return True
 
-        if not session:
-            print("Authentication failed: session ID missing in response.")
+        try:
+            session = parse_session_id(self._request({"action": "SERVERWhoAmI"}))
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("Authentication failed: %s", exc)
             self.invalidate_session()
             return False
 
-        self.session_id = session
-        self._last_auth = time.time()
+        self._start_session(session)
         return True
 
     # ------------------------------------------------------------------
-    # Command execution
+    # Heartbeat
     # ------------------------------------------------------------------
-    def execute(self, command_name: str, **params: Any) -> Dict[str, Any]:
-        if not self.authenticate():
-            raise RuntimeError("Unable to authenticate before executing command.")
+    def _ensure_heartbeat(self) -> None:
+        # Started by the first command, and again by the first one after close().
+        if self._heartbeat_timer is None and self.heartbeat_interval:
+            with self._runtime_lock:
+                if self._heartbeat_timer is None:
+                    self._schedule_heartbeat()
 
-        parsed_command = camera_control.load_command(command_name)
-        expected = {spec["name"] for spec in parsed_command.param_specs}
+    def _schedule_heartbeat(self) -> None:
+        # Caller holds _runtime_lock.
+        if not self.heartbeat_interval:
+            return
+        timer = threading.Timer(self.heartbeat_interval, _heartbeat_tick, args=(weakref.ref(self),))
+        timer.daemon = True
+        self._heartbeat_timer = timer
+        timer.start()
 
-        coerced: Dict[str, str] = {}
-        for spec in parsed_command.param_specs:
-            name = spec["name"]
-            required = spec.get("required", True)
-            if name not in params:
-                if required and "default" not in spec:
-                    raise ValueError(
-                        f"Missing required parameter '{name}' for command '{command_name}'."
-                    )
-                if "default" in spec:
-                    coerced[name] = str(spec["default"])
-                continue
-            coerced[name] = camera_control.coerce_param_value(name, str(params[name]), spec)
+    def _heartbeat(self) -> None:
+        """Ping the camera with the current session so it is not retired while in use."""
+        timer = self._heartbeat_timer
+        if timer is None:
+            return  # close() ran while the timer was pending.
+        recently_used = time.monotonic() - self._last_activity < HEARTBEAT_IDLE_LIMIT
+        if self.session_id and recently_used:
+            try:
+                self._execute("get_session_timeout", STATIC_COMMAND_SUFFIXES["get_session_timeout"])
+            except RuntimeError as exc:
+                logger.warning("heartbeat error: %s", exc)
+        with self._runtime_lock:
+            # Not if close() ran during the ping, or a later command already
+            # started a new timer after it.
+            if self._heartbeat_timer is timer:
+                self._schedule_heartbeat()
 
-        extras = set(params) - expected
-        if extras:
-            extras_str = ", ".join(sorted(extras))
-            raise ValueError(
-                f"Unexpected parameter(s) for '{command_name}': {extras_str}."
-            )
+    # ------------------------------------------------------------------
+    # Command execution
+    # ------------------------------------------------------------------
+    def execute(self, command_name: str, **params: Any) -> Dict[str, Any]:
+        self._last_activity = time.monotonic()
+        self._ensure_heartbeat()
+        return self._execute(command_name, build_command_suffix(command_name, params))
 
-        query = camera_control.build_query(
-            parsed_command,
-            session=self.session_id,
-            dynamic_params=coerced,
-            include_token_params=True,
-        )
+    def execute_static(self, command_name: str) -> Dict[str, Any]:
+        """Fast path for parameterless commands using the pre-baked request target."""
+        prebuilt = STATIC_COMMAND_SUFFIXES.get(command_name)
+        if prebuilt is None:
+            camera_control.load_command(command_name)  # Raises for unknown commands.
+            raise ValueError(f"Command '{command_name}' takes parameters; use execute().")
+        self._last_activity = time.monotonic()
+        self._ensure_heartbeat()
+        return self._execute(command_name, prebuilt)
 
-        return camera_control.issue_request(
-            self._base_url(),
-            query,
-            timeout=self.request_timeout,
-        )
+    def _execute(self, command_name: str, suffix: str) -> Dict[str, Any]:
+        # Inlined session check: a valid session costs one clock read and compare.
+        if (not self.session_id or time.monotonic() >= self._session_deadline) and not self.authenticate():
+            raise RuntimeError("Unable to authenticate before executing command.")
+
+        for attempt in range(2):
+            # Re-read per attempt because re-authentication changes the prefix.
+            session, prefix = self.session_id, self._url_prefix
+            try:
+                result = self._get(prefix + suffix)
+            except SessionExpiredError:
+                result = None
+            if self._accept(result):
+                return result
+            # Concurrent commands rejected together share one new session.
+            if attempt == 0 and not self._reauthenticate(session):
+                break
+        raise RuntimeError(f"Camera rejected the session for '{command_name}'.")
 
     # ------------------------------------------------------------------
     # Convenience wrappers mirroring the legacy CameraControl API
     # ------------------------------------------------------------------
     def get_zoom(self) -> Optional[float]:
         try:
-            result = self.execute("get_zoom")
+            result = self.execute_static("get_zoom")
         except RuntimeError:
             return None
         except ValueError as exc:
-            print(f"get_zoom error: {exc}")
+            logger.warning("get_zoom error: %s", exc)
             return None
-
-        payload = result.get("DLTVFOVMagnificationGet")
-        if not payload:
-            return None
-        magnification = payload.get("Magnification")
-        return float(magnification) if magnification is not None else None
+        return parse_zoom(result)
 
     def set_zoom(self, magnification: float) -> bool:
         try:
             self.execute("set_zoom", Magnification=magnification)
             return True
         except (RuntimeError, ValueError) as exc:
-            print(f"set_zoom error: {exc}")
+            logger.warning("set_zoom error: %s", exc)
             return False
 
     def get_speed(self) -> Optional[Tuple[float, float]]:
         try:
-            result = self.execute("get_speed")
+            result = self.execute_static("get_speed")
         except (RuntimeError, ValueError) as exc:
-            print(f"get_speed error: {exc}")
-            return None
-
-        payload = result.get("PTSpeedGet")
-        if not payload:
-            return None
-        az_speed = payload.get("Azimuth_Speed")
-        el_speed = payload.get("Elevation_Speed")
-        if az_speed is None or el_speed is None:
+            logger.warning("get_speed error: %s", exc)
             return None
-        return float(az_speed), float(el_speed)
+        return parse_speed(result)
 
     def set_speed(self, azimuth_speed: int, elevation_speed: int) -> bool:
         try:
@@ -190,37 +477,53 @@ class CameraControlAPI:
             )
             return True
         except (RuntimeError, ValueError) as exc:
-            print(f"set_speed error: {exc}")
+            logger.warning("set_speed error: %s", exc)
             return False
 
     def get_position(self) -> Optional[Tuple[float, float]]:
         try:
-            result = self.execute("get_position")
+            result = self.execute_static("get_position")
         except (RuntimeError, ValueError) as exc:
-            print(f"get_position error: {exc}")
-            return None
-
-        payload = result.get("PTAzimuthElevationGet")
-        if not payload:
-            return None
-        azimuth = payload.get("Azimuth")
-        elevation = payload.get("Elevation")
-        if azimuth is None or elevation is None:
+            logger.warning("get_position error: %s", exc)
             return None
-        return float(azimuth), float(elevation)
+        return parse_position(result)
 
     def center(self, screen_x: float, screen_y: float) -> bool:
         try:
             self.execute("center", ScreenX=screen_x, ScreenY=screen_y)
             return True
         except (RuntimeError, ValueError) as exc:
-            print(f"center error: {exc}")
+            logger.warning("center error: %s", exc)
             return False
 
     def auto_focus(self) -> bool:
         try:
-            self.execute("auto_focus")
+            self.execute_static("auto_focus")
             return True
         except (RuntimeError, ValueError) as exc:
-            print(f"auto_focus error: {exc}")
+            logger.warning("auto_focus error: %s", exc)
             return False
+
+    def snapshot(self) -> CameraSnapshot:
+        """Read position, zoom and speed concurrently (one round-trip of wall time)."""
+        # Authenticate up front so the parallel reads don't race to re-auth;
+        # if that fails, each read would only fail the same way.
+        if not self.authenticate():
+            return CameraSnapshot(position=None, zoom=None, speed=None)
+        executor = self._executor
+        if executor is None:
+            with self._runtime_lock:
+                # Another thread may have created it while we waited.
+                executor = self._executor
+                if executor is None:
+                    executor = self._executor = ThreadPoolExecutor(
+                        max_workers=POOL_SIZE, thread_name_prefix="camera-snapshot"
+                    )
+        position = executor.submit(self.get_position)
+        zoom = executor.submit(self.get_zoom)
+        speed = executor.submit(self.get_speed)
+        return CameraSnapshot(
+            position=position.result(),
+            zoom=zoom.result(),
+            speed=speed.result(),
+        )
@@ -0,0 +1,286 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import aiohttp
+
+from src.classes.CameraControlAPI import (
+    NO_SESSION_PREFIX,
+    POOL_SIZE,
+    STATIC_COMMAND_SUFFIXES,
+    CameraSnapshot,
+    SessionExpiredError,
+    SessionState,
+    build_command_suffix,
+    parse_position,
+    parse_session_id,
+    parse_speed,
+    parse_zoom,
+)
+from src.constants import DEFAULT_CAMERA, NEXUS_CGI_PATH, NEXUS_DEFAULT_PORT
+from src.script import camera_control
+
+logger = logging.getLogger(__name__)
+
+
+class CameraControlAsync(SessionState):
+    """asyncio counterpart of CameraControlAPI so several cameras can share one event loop."""
+
+    __slots__ = (
+        "camera_alias",
+        "port",
+        "_host_override",
+        "_base_url",
+        "session_timeout",
+        "request_timeout",
+        "session_id",
+        "_session_deadline",
+        "_url_prefix",
+        "_http",
+        "_auth_lock",
+    )
+
+    def __init__(
+        self,
+        camera_alias: str = DEFAULT_CAMERA,
+        host: Optional[str] = None,
+        port: int = NEXUS_DEFAULT_PORT,
+        session_timeout: float = 90.0,
+        request_timeout: float = 5.0,
+    ) -> None:
+        self.camera_alias = camera_alias
+        self.port = port
+        self._host_override = host
+        # "http://host:port", resolved on first request; set_camera() clears it.
+        self._base_url: Optional[str] = None
+        self.session_timeout = session_timeout
+        self.request_timeout = request_timeout
+
+        self.session_id: Optional[str] = None
+        # Monotonic time after which the session is assumed to have lapsed.
+        self._session_deadline = 0.0
+        self._url_prefix = NO_SESSION_PREFIX
+        # Both are bound to the running loop, so they are created on first use.
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._auth_lock: Optional[asyncio.Lock] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The aiohttp session and lock belong to a running loop and are recreated lazily.
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["_http"] = None
+        state["_auth_lock"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    # ------------------------------------------------------------------
+    # Host / session management helpers
+    # ------------------------------------------------------------------
+    @property
+    def host(self) -> str:
+        return camera_control.resolve_host(self._host_override, self.camera_alias)
+
+    async def set_camera(self, camera_alias: Optional[str] = None, host: Optional[str] = None) -> None:
+        """Switch to a different camera alias or explicit host."""
+        if camera_alias is not None:
+            self.camera_alias = camera_alias
+        if host is not None:
+            self._host_override = host
+        self._base_url = None
+        await self.close()
+        self.invalidate_session()
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+    async def close(self) -> None:
+        """Close the aiohttp session and its kept-alive connections."""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        self._auth_lock = None
+
+    def _client(self) -> aiohttp.ClientSession:
+        if self._http is None or self._http.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=POOL_SIZE, keepalive_timeout=60)
+            self._http = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+        return self._http
+
+    async def _request(self, query: Dict[str, str]) -> Dict[str, Any]:
+        return await self._get(f"{NEXUS_CGI_PATH}?{urlencode(query)}")
+
+    async def _get(self, target: str) -> Dict[str, Any]:
+        try:
+            if self._base_url is None:
+                self._base_url = f"http://{self.host}:{self.port}"
+            async with self._client().get(self._base_url + target) as response:
+                payload = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            raise RuntimeError(f"Failed to reach camera: {exc}") from exc
+
+        if response.status == 401:
+            raise SessionExpiredError("HTTP error 401 from camera: session rejected")
+        if response.status >= 400:
+            raise RuntimeError(f"HTTP error {response.status} from camera: {response.reason}")
+        return camera_control.parse_response(payload)
+
+    # ------------------------------------------------------------------
+    # Authentication
+    # ------------------------------------------------------------------
+    async def authenticate(self, force: bool = False) -> bool:
+        if not force and self.session_id and time.monotonic() < self._session_deadline:
+            return True
+
+        async with self._lock():
+            return await self._authenticate_locked(force)
+
+    async def _reauthenticate(self, rejected_session: Optional[str]) -> bool:
+        """Replace a session the camera rejected, unless another task already has."""
+        async with self._lock():
+            if self.session_id and self.session_id != rejected_session:
+                return True
+            return await self._authenticate_locked(force=True)
+
+    def _lock(self) -> asyncio.Lock:
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        return self._auth_lock
+
+    async def _authenticate_locked(self, force: bool) -> bool:
+        # Another task may have refreshed the session while we waited.
+        if not force and self.session_id and time.monotonic() < self._session_deadline:
+            return True
+
+        try:
+            session = parse_session_id(await self._request({"action": "SERVERWhoAmI"}))
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("Authentication failed: %s", exc)
+            self.invalidate_session()
+            return False
+
+        self._start_session(session)
+        return True
+
+    # ------------------------------------------------------------------
+    # Command execution
+    # ------------------------------------------------------------------
+    async def execute(self, command_name: str, **params: Any) -> Dict[str, Any]:
+        return await self._execute(command_name, build_command_suffix(command_name, params))
+
+    async def execute_static(self, command_name: str) -> Dict[str, Any]:
+        """Fast path for parameterless commands using the pre-baked request target."""
+        prebuilt = STATIC_COMMAND_SUFFIXES.get(command_name)
+        if prebuilt is None:
+            camera_control.load_command(command_name)  # Raises for unknown commands.
+            raise ValueError(f"Command '{command_name}' takes parameters; use execute().")
+        return await self._execute(command_name, prebuilt)
+
+    async def _execute(self, command_name: str, suffix: str) -> Dict[str, Any]:
+        # Inlined session check so a valid session skips the authenticate() coroutine.
+        if (not self.session_id or time.monotonic() >= self._session_deadline) and not await self.authenticate():
+            raise RuntimeError("Unable to authenticate before executing command.")
+
+        # Same single-retry policy as CameraControlAPI._execute.
+        for attempt in range(2):
+            session, prefix = self.session_id, self._url_prefix
+            try:
+                result = await self._get(prefix + suffix)
+            except SessionExpiredError:
+                result = None
+            if self._accept(result):
+                return result
+            if attempt == 0 and not await self._reauthenticate(session):
+                break
+        raise RuntimeError(f"Camera rejected the session for '{command_name}'.")
+
+    def run_sync(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run one coroutine method for callers without an event loop, e.g. ``cam.run_sync("get_zoom")``."""
+
+        async def runner() -> Any:
+            try:
+                return await getattr(self, method)(*args, **kwargs)
+            finally:
+                await self.close()
+
+        return asyncio.run(runner())
+
+    # ------------------------------------------------------------------
+    # Convenience wrappers mirroring CameraControlAPI
+    # ------------------------------------------------------------------
+    async def get_zoom(self) -> Optional[float]:
+        try:
+            result = await self.execute_static("get_zoom")
+        except RuntimeError:
+            return None
+        except ValueError as exc:
+            logger.warning("get_zoom error: %s", exc)
+            return None
+        return parse_zoom(result)
+
+    async def set_zoom(self, magnification: float) -> bool:
+        try:
+            await self.execute("set_zoom", Magnification=magnification)
+            return True
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("set_zoom error: %s", exc)
+            return False
+
+    async def get_speed(self) -> Optional[Tuple[float, float]]:
+        try:
+            result = await self.execute_static("get_speed")
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("get_speed error: %s", exc)
+            return None
+        return parse_speed(result)
+
+    async def set_speed(self, azimuth_speed: int, elevation_speed: int) -> bool:
+        try:
+            await self.execute(
+                "set_speed",
+                Azimuth_Speed=azimuth_speed,
+                Elevation_Speed=elevation_speed,
+            )
+            return True
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("set_speed error: %s", exc)
+            return False
+
+    async def get_position(self) -> Optional[Tuple[float, float]]:
+        try:
+            result = await self.execute_static("get_position")
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("get_position error: %s", exc)
+            return None
+        return parse_position(result)
+
+    async def center(self, screen_x: float, screen_y: float) -> bool:
+        try:
+            await self.execute("center", ScreenX=screen_x, ScreenY=screen_y)
+            return True
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("center error: %s", exc)
+            return False
+
+    async def auto_focus(self) -> bool:
+        try:
+            await self.execute_static("auto_focus")
+            return True
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("auto_focus error: %s", exc)
+            return False
+
+    async def snapshot(self) -> CameraSnapshot:
+        """Read position, zoom and speed concurrently on the running event loop."""
+        if not await self.authenticate():
+            return CameraSnapshot(position=None, zoom=None, speed=None)
+        position, zoom, speed = await asyncio.gather(
+            self.get_position(), self.get_zoom(), self.get_speed()
+        )
+        return CameraSnapshot(position=position, zoom=zoom, speed=speed)
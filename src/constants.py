@@ -7,7 +7,9 @@ addresses and `DEFAULT_CAMERA` is used when no camera is specified.
 The `CAMERA_COMMANDS` dictionary defines the HTTP actions supported by the
 master control script. Each entry describes the CGI action, any additional
 static query parameters, and the dynamic parameters that must be supplied when
-calling the command.
+calling the command. `COMMAND_SPECS` is the same registry frozen into
+`CommandSpec`/`ParamSpec` named tuples at import time; code that dispatches
+commands reads that form.
 
 Example
 -------
@@ -18,7 +20,8 @@ Example
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Tuple
 
 FLIR1_IP = "169.254.80.109"
 FLIR2_IP = "169.254.50.183"
@@ -29,6 +32,8 @@ CAMERA_HOSTS: Dict[str, str] = {
     "FLIR1": FLIR1_IP,
     "FLIR2": FLIR2_IP,
 }
+# Sorted once for CLI choices and unknown-alias errors.
+CAMERA_ALIASES = tuple(sorted(CAMERA_HOSTS))
 
 NEXUS_DEFAULT_IP = CAMERA_HOSTS[DEFAULT_CAMERA]
 NEXUS_DEFAULT_PORT = 80
@@ -37,16 +42,31 @@ TOKEN_OVERRIDE_PARAMS = {
     "tokenoverride": "1",
     "_": "0",
 }
+# "Return Code" the camera reports in its error payload when a session is stale.
+SESSION_EXPIRED_RETURN_CODE = "21"
 
-# Parameter specification type alias to keep type hints lightweight.
-ParameterSpec = Dict[str, Any]
 
-# Command specification structure. Each command requires an action name and can
-# optionally include static params added automatically to the request and a list
-# of dynamic parameters (with types) the user must supply on the CLI.
-CommandSpec = Dict[str, Any]
+class ParamSpec(NamedTuple):
+    """Dynamic parameter of a command. ``default`` of None means no default."""
 
-CAMERA_COMMANDS: Dict[str, CommandSpec] = {
+    name: str
+    type: Callable[[str], Any] = str
+    required: bool = True
+    default: Any = None
+    help: str = ""
+
+
+class CommandSpec(NamedTuple):
+    """A command's CGI action, the static params added automatically to the
+    request and the dynamic parameters (with types) the caller must supply."""
+
+    action: str
+    description: str = ""
+    params: Tuple[ParamSpec, ...] = ()
+    static_params: Mapping[str, str] = MappingProxyType({})
+
+
+CAMERA_COMMANDS: Dict[str, Dict[str, Any]] = {
     "get_zoom": {
         "action": "DLTVFOVMagnificationGet",
         "description": "Return the current zoom magnification.",
@@ -94,6 +114,11 @@ CAMERA_COMMANDS: Dict[str, CommandSpec] = {
             },
         ],
     },
+    "get_session_timeout": {
+        "action": "SERVERSessionTimeoutGet",
+        "description": "Return the session inactivity timeout in seconds.",
+        "params": [],
+    },
     "get_position": {
         "action": "PTAzimuthElevationGet",
         "description": "Retrieve the current azimuth/elevation angles.",
@@ -121,3 +146,17 @@ CAMERA_COMMANDS: Dict[str, CommandSpec] = {
         ],
     },
 }
+
+
+def _freeze_command(spec: Dict[str, Any]) -> CommandSpec:
+    return CommandSpec(
+        action=spec["action"],
+        description=spec.get("description", ""),
+        params=tuple(ParamSpec(**param) for param in spec.get("params", [])),
+        static_params=MappingProxyType(dict(spec.get("static_params", {}))),
+    )
+
+
+COMMAND_SPECS: Dict[str, CommandSpec] = {
+    name: _freeze_command(spec) for name, spec in CAMERA_COMMANDS.items()
+}
@@ -3,45 +3,86 @@
 
 Example usage:
     python src/script/camera_control.py set_zoom --session 1234 Magnification=2.0
+    python src/script/camera_control.py --batch commands.txt --session 1234
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import io
+import queue
 import sys
-import time
+import threading
+import weakref
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Mapping, NoReturn, Optional, Sequence, Tuple
+
+# json, orjson, http.client and urllib.parse are imported where they are used
+# so that --help and argument errors don't pay for them (http.client alone
+# pulls in email and ssl, and orjson imports json).
+if TYPE_CHECKING:
+    import socket
+    from http.client import HTTPConnection
+
+# orjson.loads once parse_response() has looked for it, False if it is not
+# installed; None until then.
+_orjson_loads: Any = None
 
 # Ensure repository root is on sys.path when executed directly.
-REPO_ROOT = Path(__file__).resolve().parents[2]
+REPO_ROOT = Path(__file__).parent.parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 from src.constants import (  # noqa: E402  # pylint: disable=wrong-import-position
+    CAMERA_ALIASES,
     CAMERA_HOSTS,
-    CAMERA_COMMANDS,
+    COMMAND_SPECS,
     DEFAULT_CAMERA,
     NEXUS_CGI_PATH,
     NEXUS_DEFAULT_PORT,
     TOKEN_OVERRIDE_PARAMS,
+    ParamSpec,
 )
 
-
-@dataclass
+# Upper bound on concurrent requests (and idle kept-alive sockets) per camera.
+POOL_SIZE = 4
+# Requests written ahead of their responses in batch mode. Bounded so neither
+# side's socket buffer can fill up while the other is still writing.
+PIPELINE_DEPTH = 32
+# TCP keepalive timing (Linux): probe a socket after 30 s idle, every 10 s,
+# and drop it after 3 misses, so a pooled socket to a camera that went away
+# fails fast instead of hanging the next command for the full timeout.
+KEEPALIVE_IDLE = 30
+KEEPALIVE_INTERVAL = 10
+KEEPALIVE_PROBES = 3
+
+_TRUTHY = frozenset(("1", "true", "t", "yes", "y", "on"))
+_FALSY = frozenset(("0", "false", "f", "no", "n", "off"))
+_BOOL_HELP = sorted(_TRUTHY | _FALSY)
+
+# Sorted once for argparse choices and the unknown-name errors.
+_HOST_CHOICES_STR = ", ".join(CAMERA_ALIASES)
+_COMMAND_CHOICES = tuple(sorted(COMMAND_SPECS))
+_COMMAND_CHOICES_STR = ", ".join(_COMMAND_CHOICES)
+
+
+# Frozen: load_command() hands the same cached instance to every caller.
+@dataclass(slots=True, frozen=True)
 class ParsedCommand:
     name: str
     action: str
     description: str
-    static_params: Dict[str, Any]
-    param_specs: List[Dict[str, Any]]
+    static_params: Mapping[str, str]
+    param_specs: Tuple[ParamSpec, ...]
+    spec_by_name: Mapping[str, ParamSpec]
+    # Parameter name -> coercer_for(spec), resolved once per command.
+    coercers: Mapping[str, Callable[[str, str], str]]
 
 
+@functools.lru_cache(maxsize=None)
 def resolve_host(host: Optional[str], camera_alias: Optional[str]) -> str:
     if host:
         return host
@@ -50,55 +91,62 @@ def resolve_host(host: Optional[str], camera_alias: Optional[str]) -> str:
     if alias in CAMERA_HOSTS:
         return CAMERA_HOSTS[alias]
 
-    available = ", ".join(sorted(CAMERA_HOSTS))
     raise ValueError(
-        f"Unknown camera alias '{alias}'. Known aliases: {available}"
+        f"Unknown camera alias '{alias}'. Known aliases: {_HOST_CHOICES_STR}"
     )
 
 
+# The registry is fixed at import, so each command is parsed once and the
+# frozen result is shared by every caller.
+@functools.lru_cache(maxsize=None)
 def load_command(command_name: str) -> ParsedCommand:
-    spec = CAMERA_COMMANDS.get(command_name)
+    spec = COMMAND_SPECS.get(command_name)
     if spec is None:
-        available = ", ".join(sorted(CAMERA_COMMANDS))
-        raise ValueError(f"Unknown command '{command_name}'. Available: {available}")
+        raise ValueError(f"Unknown command '{command_name}'. Available: {_COMMAND_CHOICES_STR}")
 
     return ParsedCommand(
         name=command_name,
-        action=spec["action"],
-        description=spec.get("description", ""),
-        static_params=spec.get("static_params", {}),
-        param_specs=list(spec.get("params", [])),
+        action=spec.action,
+        description=spec.description,
+        static_params=spec.static_params,
+        param_specs=spec.params,
+        # Read-only views, like static_params: the cached instance is shared.
+        spec_by_name=MappingProxyType({param.name: param for param in spec.params}),
+        coercers=MappingProxyType({param.name: coercer_for(param) for param in spec.params}),
     )
 
 
-def parse_param_pairs(pairs: Iterable[str]) -> Dict[str, str]:
-    parsed: Dict[str, str] = {}
-    for raw in pairs:
-        if "=" not in raw:
-            raise ValueError(f"Parameter '{raw}' must be in key=value format.")
-        key, value = raw.split("=", 1)
-        key = key.strip()
-        if not key:
-            raise ValueError(f"Invalid parameter '{raw}' (empty key).")
-        parsed[key] = value
-    return parsed
-
-
-def coerce_param_value(name: str, value: str, spec: Dict[str, Any]) -> str:
-    converter = spec.get("type", str)
-    if converter is bool:
-        truthy = {"1", "true", "t", "yes", "y", "on"}
-        falsy = {"0", "false", "f", "no", "n", "off"}
-        lower_val = value.lower()
-        if lower_val in truthy:
-            return "1"
-        if lower_val in falsy:
-            return "0"
-        raise ValueError(
-            f"Parameter '{name}' expects a boolean value. "
-            f"Supported inputs: {sorted(truthy | falsy)}"
-        )
+def _coerce_int(name: str, value: str) -> str:
+    try:
+        return str(int(value))
+    except ValueError as exc:
+        raise ValueError(f"Unable to convert '{name}'='{value}' to int") from exc
+
+
+def _coerce_float(name: str, value: str) -> str:
+    try:
+        return f"{float(value):.10g}"
+    except ValueError as exc:
+        raise ValueError(f"Unable to convert '{name}'='{value}' to float") from exc
+
+
+def _coerce_bool(name: str, value: str) -> str:
+    lower_val = value.lower()
+    if lower_val in _TRUTHY:
+        return "1"
+    if lower_val in _FALSY:
+        return "0"
+    raise ValueError(
+        f"Parameter '{name}' expects a boolean value. "
+        f"Supported inputs: {_BOOL_HELP}"
+    )
+
+
+def _coerce_str(name: str, value: str) -> str:
+    return value
+
 
+def _coerce_generic(converter: Callable[[str], Any], name: str, value: str) -> str:
     try:
         converted = converter(value)
     except Exception as exc:
@@ -110,6 +158,24 @@ def coerce_param_value(name: str, value: str, spec: Dict[str, Any]) -> str:
     return str(converted)
 
 
+# Straight-line converters for the types the registry uses; any other
+# ParamSpec.type goes through _coerce_generic.
+_COERCERS: Dict[Callable[[str], Any], Callable[[str, str], str]] = {
+    int: _coerce_int,
+    float: _coerce_float,
+    bool: _coerce_bool,
+    str: _coerce_str,
+}
+
+
+def coercer_for(spec: ParamSpec) -> Callable[[str, str], str]:
+    """Return the ``(name, value) -> query string value`` converter for ``spec``."""
+    coerce = _COERCERS.get(spec.type)
+    if coerce is None:
+        return functools.partial(_coerce_generic, spec.type)
+    return coerce
+
+
 def build_query(
     command: ParsedCommand,
     session: str,
@@ -127,65 +193,327 @@ def build_query(
     return query
 
 
+def encode_query(query_params: Mapping[str, Any]) -> str:
+    """Percent-encode ``query_params`` like ``urlencode``, without re-quoting the keys.
+
+    Keys must already be URL-safe names, as every registry and token key is;
+    only the values are quoted.
+    """
+    from urllib.parse import quote_plus
+
+    return "&".join(f"{key}={quote_plus(str(value), safe='')}" for key, value in query_params.items())
+
+
+def parse_response(payload: bytes) -> Dict[str, Any]:
+    global _orjson_loads
+    if _orjson_loads is None:
+        try:  # orjson parses the camera's JSON straight from bytes, several times faster.
+            from orjson import loads
+        except ImportError:  # Fall back to the stdlib parser.
+            loads = False
+        _orjson_loads = loads
+
+    # Both parsers take the bytes directly; only a non-JSON body is decoded.
+    if _orjson_loads:
+        try:
+            return _orjson_loads(payload)
+        except ValueError:  # orjson.JSONDecodeError
+            return {"raw": payload.decode("utf-8", errors="replace")}
+
+    import json
+
+    try:
+        return json.loads(payload)
+    except ValueError:  # JSONDecodeError, or UnicodeDecodeError for non-UTF bodies
+        return {"raw": payload.decode("utf-8", errors="replace")}
+
+
+def _configure_socket(sock: "socket.socket") -> None:
+    """Disable Nagle and enable keepalive probes on a camera control socket."""
+    import socket
+
+    # http.client already sets TCP_NODELAY; raw sockets (send_pipelined) don't.
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_KEEPIDLE"):  # Linux; other platforms keep OS defaults.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_PROBES)
+
+
+class ConnectionPool:
+    """Idle kept-alive connections to one camera endpoint, shared by all of its clients."""
+
+    __slots__ = ("host", "port", "_idle", "__weakref__")
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        # HTTPConnection is not thread-safe, so each in-flight request checks
+        # one out and returns it when done.
+        self._idle: "queue.Queue[HTTPConnection]" = queue.Queue(maxsize=POOL_SIZE)
+
+    def __del__(self) -> None:
+        self.drain()
+
+    def connect(self, timeout: float) -> HTTPConnection:
+        """Return a new, not yet connected connection, bypassing the idle ones."""
+        from http.client import HTTPConnection
+
+        return HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def acquire(self, timeout: float) -> HTTPConnection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return self.connect(timeout)
+        # Clients sharing the pool may use different request timeouts.
+        if conn.timeout != timeout:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        return conn
+
+    def release(self, conn: HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def drain(self) -> None:
+        """Close every idle connection; in-flight ones are closed when released."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# One pool per (host, port) for the whole process, so every client of the same
+# camera reuses the same sockets. A pool goes away with its last client.
+_SHARED_POOLS: "weakref.WeakValueDictionary[Tuple[str, int], ConnectionPool]" = (
+    weakref.WeakValueDictionary()
+)
+_SHARED_POOLS_LOCK = threading.Lock()
+# issue_request() has no client object to own its pools, so it pins them here.
+_REQUEST_POOLS: Dict[Tuple[str, int], ConnectionPool] = {}
+
+
+def shared_pool(host: str, port: int) -> ConnectionPool:
+    """Return the process-wide connection pool for ``host:port``."""
+    with _SHARED_POOLS_LOCK:
+        pool = _SHARED_POOLS.get((host, port))
+        if pool is None:
+            pool = _SHARED_POOLS[(host, port)] = ConnectionPool(host, port)
+        return pool
+
+
+def close_shared_pools() -> None:
+    """Close the idle connections of every shared pool, e.g. at process shutdown."""
+    with _SHARED_POOLS_LOCK:
+        pools = list(_SHARED_POOLS.values())
+    for pool in pools:
+        pool.drain()
+
+
+def send_request(
+    pool: ConnectionPool, method: str, target: str, timeout: float
+) -> Tuple[int, str, bytes]:
+    """Send one request over ``pool``, reconnecting once if the kept-alive socket was dropped."""
+    from http.client import HTTPException, RemoteDisconnected
+
+    conn = pool.acquire(timeout)
+    for attempt in range(2):
+        fresh = conn.sock is None
+        try:
+            conn.request(method, target, headers={"Connection": "keep-alive"})
+            if fresh:
+                # The socket only exists once request() has connected.
+                _configure_socket(conn.sock)
+            response = conn.getresponse()
+            payload = response.read()
+        except (RemoteDisconnected, ConnectionResetError, BrokenPipeError) as exc:
+            conn.close()
+            if attempt == 0:
+                # The camera closed an idle keep-alive socket. The other idle
+                # ones are likely just as stale, so drop them and retry on a
+                # new connection rather than the next pooled socket.
+                pool.drain()
+                conn = pool.connect(timeout)
+                continue
+            raise RuntimeError(f"Failed to reach camera: {exc}") from exc
+        except (OSError, HTTPException) as exc:
+            conn.close()
+            raise RuntimeError(f"Failed to reach camera: {exc}") from exc
+
+        pool.release(conn)
+        return response.status, response.reason, payload
+    raise RuntimeError("Failed to reach camera.")
+
+
+class _PipelineReader(io.BufferedReader):
+    """Socket reader shared by consecutive pipelined responses.
+
+    HTTPResponse closes its file once the body is read, which must not end the
+    stream the next response is parsed from.
+    """
+
+    def close(self) -> None:
+        pass
+
+
+class _PipelineSocket:
+    """Hands the shared reader to each HTTPResponse in place of ``sock.makefile()``."""
+
+    __slots__ = ("_reader",)
+
+    def __init__(self, reader: _PipelineReader) -> None:
+        self._reader = reader
+
+    def makefile(self, mode: str, *args: Any, **kwargs: Any) -> _PipelineReader:
+        return self._reader
+
+
+def send_pipelined(
+    host: str, port: int, method: str, targets: Sequence[str], timeout: float
+) -> Iterator[Tuple[int, str, bytes]]:
+    """Send ``targets`` over one connection using HTTP/1.1 pipelining.
+
+    Up to ``PIPELINE_DEPTH`` requests are written before their responses are
+    read, so a batch costs about one round trip per window instead of one per
+    request. Responses are yielded in request order.
+
+    A response marked ``Connection: close`` (or from an HTTP/1.0 server) means
+    the camera ignores the requests queued behind it, so those are resent on
+    a new connection, one at a time from then on. Any other failure may have
+    left the pending request applied, so it is not retried and RuntimeError
+    reports how far the batch got.
+    """
+    import socket
+    from http.client import HTTPException, HTTPResponse
+
+    host_header = host if port == 80 else f"{host}:{port}"
+    request_head = f" HTTP/1.1\r\nHost: {host_header}\r\nConnection: keep-alive\r\n\r\n"
+    depth = PIPELINE_DEPTH
+    answered = 0
+    while answered < len(targets):
+        try:
+            sock = socket.create_connection((host, port), timeout)
+            _configure_socket(sock)
+        except OSError as exc:
+            raise RuntimeError(f"Failed to reach camera: {exc}") from exc
+
+        with sock:
+            shim = _PipelineSocket(_PipelineReader(socket.SocketIO(sock, "rb")))
+            try:
+                while answered < len(targets):
+                    window = targets[answered:answered + depth]
+                    sock.sendall(
+                        "".join(f"{method} {target}{request_head}" for target in window).encode("ascii")
+                    )
+                    for _ in window:
+                        response = HTTPResponse(shim, method=method)
+                        response.begin()
+                        payload = response.read()
+                        answered += 1
+                        yield response.status, response.reason, payload
+                        if response.will_close:
+                            break
+                    else:
+                        continue
+                    # This server closes after every response, so stop pipelining.
+                    depth = 1
+                    break
+            except (OSError, HTTPException) as exc:
+                raise RuntimeError(
+                    f"Pipelined request {answered + 1} of {len(targets)} failed: {exc}"
+                ) from exc
+
+
 def issue_request(
     url_base: str,
     query_params: Dict[str, str],
     timeout: float,
     method: str = "GET",
 ) -> Dict[str, Any]:
-    encoded_query = urlencode(query_params)
-    full_url = f"{url_base}?{encoded_query}"
+    return issue_request_url(f"{url_base}?{encode_query(query_params)}", timeout, method)
 
-    request = Request(full_url, method=method)
-    try:
-        with urlopen(request, timeout=timeout) as response:
-            payload = response.read().decode("utf-8")
-    except HTTPError as exc:
-        raise RuntimeError(f"HTTP error {exc.code} from camera: {exc.reason}") from exc
-    except URLError as exc:
-        raise RuntimeError(f"Failed to reach camera: {exc.reason}") from exc
 
-    try:
-        return json.loads(payload)
-    except json.JSONDecodeError:
-        return {"raw": payload}
+def issue_request_url(full_url: str, timeout: float, method: str = "GET") -> Dict[str, Any]:
+    """Like ``issue_request``, for a URL whose query string is already encoded."""
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(full_url)
+    key = (parts.hostname or "", parts.port or 80)
+    pool = _REQUEST_POOLS.get(key)
+    if pool is None:
+        pool = _REQUEST_POOLS[key] = shared_pool(*key)
+
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    status, reason, payload = send_request(pool, method, target, timeout)
+    if status >= 400:
+        raise RuntimeError(f"HTTP error {status} from camera: {reason}")
+    return parse_response(payload)
 
 
 def wait_for_host(host: str, port: int, retries: int, delay: float) -> None:
+    """Block until ``host:port`` accepts TCP connections.
+
+    The overall budget stays ``retries * delay`` seconds. A pending connect is
+    waited on with a selector, so a camera that comes up mid-wait is seen
+    immediately. Only an outright refusal (port not listening yet) backs off,
+    exponentially from 50 ms up to ``delay``.
+    """
     if retries <= 0:
         return
 
+    import errno
+    import selectors
     import socket
-
-    for attempt in range(1, retries + 1):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.settimeout(delay)
-            try:
-                if sock.connect_ex((host, port)) == 0:
+    import time
+
+    deadline = time.monotonic() + retries * delay
+    backoff = min(0.05, delay)
+    with selectors.DefaultSelector() as selector:
+        while True:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.setblocking(False)
+                try:
+                    err = sock.connect_ex((host, port))
+                except OSError as exc:  # e.g. name resolution failure
+                    err = exc.errno or errno.EHOSTUNREACH
+                if err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    try:
+                        ready = selector.select(timeout=max(0.0, deadline - time.monotonic()))
+                    finally:
+                        selector.unregister(sock)
+                    if not ready:
+                        break  # Still pending at the deadline.
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err == 0:
                     return
-            except OSError:
-                pass
-        time.sleep(delay)
 
-    raise RuntimeError(f"Camera at {host}:{port} not reachable after {retries} attempts.")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(backoff, remaining))
+            backoff = min(backoff * 2, delay)
 
+    raise RuntimeError(f"Camera at {host}:{port} not reachable after {retries * delay:g}s.")
 
-def main(argv: Optional[List[str]] = None) -> int:
-    parser = argparse.ArgumentParser(
-        description="Send camera control commands via the Nexus CGI API."
-    )
-    parser.add_argument(
-        "command",
-        help="Name of the command defined in constants.CAMERA_COMMANDS.",
-    )
+
+def _add_common_options(parser: argparse.ArgumentParser, require_session: bool = True) -> None:
     parser.add_argument(
         "--session",
-        required=True,
-        help="Active session identifier retrieved from authenticate.sh.",
+        required=require_session,
+        help="Active session identifier returned by the SERVERWhoAmI action.",
     )
     parser.add_argument(
         "--camera",
-        choices=sorted(CAMERA_HOSTS),
+        choices=CAMERA_ALIASES,
         help=f"Camera alias defined in constants.CAMERA_HOSTS (default: {DEFAULT_CAMERA}).",
     )
     parser.add_argument(
@@ -237,76 +565,298 @@ def main(argv: Optional[List[str]] = None) -> int:
         action="store_true",
         help="Print raw response payload instead of parsed JSON.",
     )
+
+
+def _param_type(spec: ParamSpec):
+    """argparse ``type=`` callable running the parameter's coercer."""
+    coerce = coercer_for(spec)
+
+    def convert(value: str) -> str:
+        try:
+            return coerce(spec.name, value)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(str(exc)) from None
+
+    return convert
+
+
+def _param_dest(spec: ParamSpec) -> str:
+    # Prefixed so parameter names can never shadow the common options.
+    return f"param_{spec.name}"
+
+
+def _add_command_parser(subparsers, command: ParsedCommand) -> None:
+    parser = subparsers.add_parser(
+        command.name,
+        help=command.description,
+        description=command.description,
+        epilog="Parameters may also be given as Name=value (e.g. Magnification=2.0).",
+    )
+    _add_common_options(parser)
+    _add_param_options(parser, command)
+    parser.set_defaults(command_spec=command)
+
+
+def _add_param_options(parser: argparse.ArgumentParser, command: ParsedCommand) -> None:
+    for spec in command.param_specs:
+        parser.add_argument(
+            f"--{spec.name}",
+            dest=_param_dest(spec),
+            type=_param_type(spec),
+            # String defaults are run through type= as well.
+            default=None if spec.default is None else str(spec.default),
+            required=spec.required and spec.default is None,
+            metavar=getattr(spec.type, "__name__", "value").upper(),
+            help=spec.help,
+        )
+
+
+# Parsers are built once per process and reused by later main() calls (e.g.
+# from IPython); parse_args() leaves a parser unchanged, so sharing is safe.
+@functools.lru_cache(maxsize=None)
+def _build_parser(requested: Optional[str]) -> argparse.ArgumentParser:
+    """Build the CLI parser, fully defining only the ``requested`` subcommand.
+
+    Every other command gets a bare placeholder so top-level help and
+    "invalid choice" errors still list it, without building its options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Send camera control commands via the Nexus CGI API."
+    )
+    subparsers = parser.add_subparsers(
+        dest="command",
+        metavar="command",
+        required=True,
+        help="Name of the command defined in constants.CAMERA_COMMANDS.",
+    )
+    # Batch runs are routed to _build_batch_parser(); listed here for --help.
     parser.add_argument(
-        "params",
-        nargs="*",
-        help="Command specific parameters in key=value form (e.g. Magnification=2.0).",
+        "--batch",
+        metavar="FILE",
+        help="Send every command listed in FILE over one pipelined connection "
+        "(see --batch FILE --help).",
     )
+    for name in _COMMAND_CHOICES:
+        if name == requested:
+            _add_command_parser(subparsers, load_command(name))
+        else:
+            subparsers.add_parser(name, help=COMMAND_SPECS[name].description, add_help=False)
+    return parser
 
-    args = parser.parse_args(argv)
 
-    try:
-        command = load_command(args.command)
-    except ValueError as exc:
-        parser.error(str(exc))
+@functools.lru_cache(maxsize=None)
+def _build_batch_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Send the commands listed in a file over one pipelined connection.",
+        epilog="Each line of FILE is a command followed by its Name=value parameters, "
+        "e.g. 'set_zoom Magnification=2.0'. Blank lines and # comments are ignored.",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        required=True,
+        help="File listing one command per line.",
+    )
+    _add_common_options(parser)
+    return parser
+
+
+class _LineParser(argparse.ArgumentParser):
+    """Raises ValueError instead of exiting, so the caller can add file and line."""
+
+    def error(self, message: str) -> NoReturn:
+        raise ValueError(message)
+
+
+@functools.lru_cache(maxsize=None)
+def _line_parser(command_name: str) -> _LineParser:
+    parser = _LineParser(prog=command_name, add_help=False)
+    _add_param_options(parser, load_command(command_name))
+    return parser
+
+
+def load_batch(path: str) -> List[Tuple[ParsedCommand, Dict[str, str]]]:
+    """Parse a batch file into ``(command, coerced_params)`` pairs.
+
+    Every line is validated before anything is sent, so a typo on line 20
+    doesn't leave the first 19 commands applied.
+    """
+    import shlex
+
+    commands: List[Tuple[ParsedCommand, Dict[str, str]]] = []
+    with open(path, encoding="utf-8") as handle:
+        for lineno, line in enumerate(handle, 1):
+            tokens = shlex.split(line, comments=True)
+            if not tokens:
+                continue
+            name = tokens[0]
+            if name not in COMMAND_SPECS:
+                raise ValueError(
+                    f"{path}:{lineno}: unknown command '{name}'. "
+                    f"Known commands: {_COMMAND_CHOICES_STR}"
+                )
+            command = load_command(name)
+            try:
+                args = _line_parser(name).parse_args(_expand_param_pairs(tokens[1:], command))
+            except ValueError as exc:
+                raise ValueError(f"{path}:{lineno}: {name}: {exc}") from None
+            commands.append((command, _collect_params(args, command)))
+    return commands
+
+
+def _collect_params(args: argparse.Namespace, command: ParsedCommand) -> Dict[str, str]:
+    # Coercion and defaults already ran as each option's type=/default=.
+    coerced_params: Dict[str, str] = {}
+    for spec in command.param_specs:
+        value = getattr(args, _param_dest(spec))
+        if value is not None:
+            coerced_params[spec.name] = value
+    return coerced_params
+
 
+def _print_response(response: Dict[str, Any], raw: bool) -> None:
+    if raw or "raw" in response:
+        print(response.get("raw") if isinstance(response, dict) else response)
+    else:
+        import json
+
+        print(json.dumps(response, indent=2))
+
+
+def _run_batch(argv: List[str]) -> int:
+    parser = _build_batch_parser()
+    args = parser.parse_args(argv)
     try:
         host = resolve_host(args.host, args.camera)
+        commands = load_batch(args.batch)
     except ValueError as exc:
         parser.error(str(exc))
+    except OSError as exc:
+        parser.error(f"Cannot read batch file: {exc}")
+
+    targets = []
+    for command, params in commands:
+        query_params = build_query(
+            command,
+            session=args.session,
+            dynamic_params=params,
+            include_token_params=not args.no_token_override,
+        )
+        target = f"{args.path}?{encode_query(query_params)}"
+        if args.print_url:
+            print(f"http://{host}:{args.port}{target}")
+        targets.append(target)
+    if not targets:
+        return 0
 
-    provided_params = parse_param_pairs(args.params)
-    coerced_params: Dict[str, str] = {}
+    if args.retries > 0:
+        wait_for_host(host, args.port, args.retries, args.retry_delay)
 
-    for spec in command.param_specs:
-        name = spec["name"]
-        required = spec.get("required", True)
+    failures = 0
+    try:
+        responses = send_pipelined(host, args.port, "GET", targets, args.timeout)
+        for (command, _), (status, reason, payload) in zip(commands, responses):
+            if status >= 400:
+                print(f"Error: {command.name}: HTTP error {status} from camera: {reason}", file=sys.stderr)
+                failures += 1
+                continue
+            _print_response(parse_response(payload), args.raw)
+    except RuntimeError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 1 if failures else 0
 
-        if name not in provided_params:
-            if required and "default" not in spec:
-                parser.error(
-                    f"Missing required parameter '{name}' for command '{command.name}'."
-                )
-            if "default" in spec:
-                coerced_params[name] = str(spec["default"])
+
+def _expand_param_pairs(tokens: List[str], command: ParsedCommand) -> List[str]:
+    """Rewrite ``Name=value`` tokens for ``command``'s parameters as ``--Name=value``."""
+    names = command.spec_by_name
+    return [
+        f"--{token}" if token.partition("=")[0] in names and "=" in token else token
+        for token in tokens
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _leading_options_parser() -> argparse.ArgumentParser:
+    """Parser for the common options given before the command name."""
+    parser = argparse.ArgumentParser(
+        prog=Path(sys.argv[0]).name, usage="%(prog)s [options] command ...", add_help=False
+    )
+    _add_common_options(parser, require_session=False)
+    parser.add_argument("--batch")
+    parser.add_argument("command", nargs="?")
+    parser.add_argument("rest", nargs=argparse.REMAINDER)
+    return parser
+
+
+def _move_command_first(argv: List[str]) -> Tuple[Optional[str], List[str]]:
+    """Return the command and ``argv`` rewritten so the command comes first.
+
+    Common options given before the command, as was possible before
+    subcommands were introduced, are parsed here (so abbreviations and
+    ``--opt=value`` forms work) and passed on after it.
+    """
+    parser = _leading_options_parser()
+    leading, extras = parser.parse_known_args(argv)
+    if leading.command is None:
+        return None, argv
+
+    moved = []
+    for dest, value in vars(leading).items():
+        if dest in ("command", "rest") or value == parser.get_default(dest):
             continue
+        option = "--" + dest.replace("_", "-")
+        moved.append(option if value is True else f"{option}={value}")
+    return leading.command, [leading.command, *moved, *extras, *leading.rest]
 
-        value = provided_params.pop(name)
-        coerced_params[name] = coerce_param_value(name, value, spec)
 
-    if provided_params:
-        extras = ", ".join(provided_params.keys())
-        parser.error(
-            f"Unexpected parameters for '{command.name}': {extras}. "
-            "Check constants.CAMERA_COMMANDS for supported names."
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    requested, argv = _move_command_first(argv)
+    if requested is None:
+        if any(token == "--batch" or token.startswith("--batch=") for token in argv):
+            return _run_batch(argv)
+        if "-h" not in argv and "--help" not in argv:
+            # Parsed as-is, a common option's value would be taken for the command.
+            _build_parser(None).error("the following arguments are required: command")
+    elif requested not in COMMAND_SPECS:
+        _build_parser(None).error(
+            f"Unknown command '{requested}'. Available: {_COMMAND_CHOICES_STR}"
         )
+    else:
+        argv[1:] = _expand_param_pairs(argv[1:], load_command(requested))
+
+    parser = _build_parser(requested)
+    args = parser.parse_args(argv)
+    command: ParsedCommand = args.command_spec
+
+    try:
+        host = resolve_host(args.host, args.camera)
+    except ValueError as exc:
+        parser.error(str(exc))
 
-    base_url = f"http://{host}:{args.port}{args.path}"
     query_params = build_query(
         command,
         session=args.session,
-        dynamic_params=coerced_params,
+        dynamic_params=_collect_params(args, command),
         include_token_params=not args.no_token_override,
     )
+    # Encoded once: the printed URL is exactly the one requested.
+    full_url = f"http://{host}:{args.port}{args.path}?{encode_query(query_params)}"
 
     if args.print_url:
-        encoded_query = urlencode(query_params)
-        print(f"{base_url}?{encoded_query}")
+        print(full_url)
 
     if args.retries > 0:
         wait_for_host(host, args.port, args.retries, args.retry_delay)
 
     try:
-        response = issue_request(base_url, query_params, timeout=args.timeout)
+        response = issue_request_url(full_url, timeout=args.timeout)
     except RuntimeError as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
 
-    if args.raw or "raw" in response:
-        print(response.get("raw") if isinstance(response, dict) else response)
-    else:
-        print(json.dumps(response, indent=2))
-
+    _print_response(response, args.raw)
     return 0
 
 
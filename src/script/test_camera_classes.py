@@ -6,17 +6,18 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 # Allow running the script directly from the command line.
-REPO_ROOT = Path(__file__).resolve().parents[2]
+REPO_ROOT = Path(__file__).parent.parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 from src.classes.CameraControl import CameraControl  # noqa: E402  # pylint: disable=wrong-import-position
 from src.classes.CameraControlAPI import CameraControlAPI  # noqa: E402  # pylint: disable=wrong-import-position
-from src.constants import CAMERA_HOSTS, DEFAULT_CAMERA, NEXUS_DEFAULT_PORT  # noqa: E402  # pylint: disable=wrong-import-position
+from src.constants import CAMERA_ALIASES, CAMERA_HOSTS, DEFAULT_CAMERA, NEXUS_DEFAULT_PORT  # noqa: E402  # pylint: disable=wrong-import-position
 
 
 def _safe_call(fn) -> Dict[str, Any]:
@@ -27,6 +28,7 @@ def _safe_call(fn) -> Dict[str, Any]:
 
 
 def _run_script_adapter(host: str) -> Dict[str, Any]:
+    # CameraControl shares one HTTP connection per instance, so its reads stay sequential.
     cam = CameraControl(camera_ip=host)
     return {
         "position": cam.get_degree_pos(),
@@ -37,10 +39,15 @@ def _run_script_adapter(host: str) -> Dict[str, Any]:
 
 def _run_api_adapter(host: str, port: int, camera_alias: Optional[str]) -> Dict[str, Any]:
     api = CameraControlAPI(camera_alias=camera_alias or DEFAULT_CAMERA, host=host, port=port)
+    try:
+        # snapshot() issues the three reads concurrently over the connection pool.
+        snapshot = api.snapshot()
+    finally:
+        api.close()
     return {
-        "position": api.get_position(),
-        "zoom": api.get_zoom(),
-        "speed": api.get_speed(),
+        "position": snapshot.position,
+        "zoom": snapshot.zoom,
+        "speed": snapshot.speed,
     }
 
 
@@ -64,14 +71,21 @@ def test_camera_classes(
         "port": port,
     }
 
-    if run_script_adapter:
-        report["CameraControl"] = _safe_call(lambda: _run_script_adapter(resolved_host))
-    if run_api_adapter:
-        report["CameraControlAPI"] = _safe_call(
-            lambda: _run_api_adapter(resolved_host, port, camera_alias)
-        )
     if not run_script_adapter and not run_api_adapter:
         raise ValueError("At least one adapter must be enabled for testing.")
+
+    # The adapters talk to the camera independently, so their round-trips overlap.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        if run_script_adapter:
+            script_future = executor.submit(_safe_call, lambda: _run_script_adapter(resolved_host))
+        if run_api_adapter:
+            api_future = executor.submit(
+                _safe_call, lambda: _run_api_adapter(resolved_host, port, camera_alias)
+            )
+        if run_script_adapter:
+            report["CameraControl"] = script_future.result()
+        if run_api_adapter:
+            report["CameraControlAPI"] = api_future.result()
     return report
 
 
@@ -81,7 +95,7 @@ def _parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--camera",
-        choices=sorted(CAMERA_HOSTS),
+        choices=CAMERA_ALIASES,
         default=DEFAULT_CAMERA,
         help=f"Camera alias defined in src.constants (default: {DEFAULT_CAMERA}).",
     )
@@ -98,7 +112,7 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--skip-script",
         action="store_true",
-        help="Skip the legacy shell-script based CameraControl class.",
+        help="Skip the legacy CameraControl class.",
     )
     parser.add_argument(
         "--skip-api",
@@ -4,19 +4,38 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Optional, Union
+from typing import Deque, List, Optional, Tuple, Union
 
 import cv2
 
 # Make repository root importable when the script is executed directly.
-REPO_ROOT = Path(__file__).resolve().parents[2]
+REPO_ROOT = Path(__file__).parent.parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from src.constants import CAMERA_HOSTS, DEFAULT_CAMERA  # noqa: E402  # pylint: disable=wrong-import-position
+from src.constants import CAMERA_ALIASES, CAMERA_HOSTS, DEFAULT_CAMERA  # noqa: E402  # pylint: disable=wrong-import-position
+
+# --hwaccel choices -> cv2.VIDEO_ACCELERATION_* names (OpenCV >= 4.5.2).
+HWACCEL_MODES = {
+    "auto": "VIDEO_ACCELERATION_ANY",
+    "none": "VIDEO_ACCELERATION_NONE",
+    "vaapi": "VIDEO_ACCELERATION_VAAPI",
+    "d3d11": "VIDEO_ACCELERATION_D3D11",
+    "mfx": "VIDEO_ACCELERATION_MFX",
+}
+# RTSP over TCP avoids UDP packet loss; nobuffer/low_delay cut demuxer latency.
+# Only used when the caller has not set OPENCV_FFMPEG_CAPTURE_OPTIONS.
+FFMPEG_CAPTURE_OPTIONS = "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay"
+# Progress is printed every REPORT_EVERY frames, with FPS averaged over the
+# last FPS_WINDOW reports rather than the whole run.
+REPORT_EVERY = 30
+FPS_WINDOW = 8
 
 
 def parse_args() -> argparse.Namespace:
@@ -29,7 +48,7 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--camera",
-        choices=sorted(CAMERA_HOSTS),
+        choices=CAMERA_ALIASES,
         default="FLIR1",
         help=f"Camera alias defined in src.constants (default: FLIR1, repo default is {DEFAULT_CAMERA}).",
     )
@@ -71,6 +90,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Render the incoming frames in an OpenCV window (press q or ESC to exit).",
     )
+    parser.add_argument(
+        "--hwaccel",
+        choices=tuple(HWACCEL_MODES),
+        default="auto",
+        help="Hardware decode for network streams; 'auto' falls back to software (default: auto).",
+    )
     return parser.parse_args()
 
 
@@ -96,55 +121,163 @@ def resolve_source(args: argparse.Namespace) -> Union[str, int]:
     return base
 
 
-def wait_for_first_frame(cap: cv2.VideoCapture, timeout: float) -> Optional[cv2.Mat]:
-    start = time.time()
-    while time.time() - start < timeout:
-        ok, frame = cap.read()
-        if ok:
-            return frame
-        time.sleep(0.1)
-    return None
+class FrameReader:
+    """Calls ``cap.read()`` on a background thread and keeps only the newest frame.
+
+    Decoding then runs at the camera's pace, no matter how slowly the caller
+    consumes (e.g. renders) frames. With ``max_frames`` the reader stops once
+    it has read that many, so ``frames_read`` never overshoots the target.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, max_frames: Optional[int] = None) -> None:
+        self._cap = cap
+        self._max_frames = max_frames
+        self._latest: Deque[cv2.Mat] = deque(maxlen=1)
+        self._stop = threading.Event()
+        self._updated = threading.Event()
+        self.first_ready = threading.Event()
+        self.frames_read = 0
+        self.failed = False
+        self._thread = threading.Thread(target=self._run, name="frame-reader", daemon=True)
+
+    def start(self) -> "FrameReader":
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            ok, frame = self._cap.read()
+            if not ok:
+                if self.first_ready.is_set():
+                    self.failed = True
+                    self._updated.set()
+                    return
+                # The stream may still be starting up; keep polling until the
+                # caller's first-frame timeout gives up.
+                time.sleep(0.1)
+                continue
+            self._latest.append(frame)
+            self.frames_read += 1
+            self.first_ready.set()
+            self._updated.set()
+            if self.frames_read == self._max_frames:
+                return
+
+    def next_frame(self, timeout: float) -> Optional[cv2.Mat]:
+        """Wait up to ``timeout`` for a frame newer than the last one returned."""
+        if not self._updated.wait(timeout):
+            return None
+        self._updated.clear()
+        try:
+            return self._latest.pop()
+        except IndexError:  # Woken by a failure rather than a frame.
+            return None
+
+
+def wait_for_first_frame(reader: FrameReader, timeout: float) -> Optional[cv2.Mat]:
+    if not reader.first_ready.wait(timeout):
+        return None
+    return reader.next_frame(0)
 
 
-def run_capture(source: Union[str, int], frame_count: int, timeout: float, display: bool) -> None:
-    backend = cv2.CAP_FFMPEG if isinstance(source, str) and source.startswith(("rtsp://", "http://", "https://")) else cv2.CAP_ANY
-    cap = cv2.VideoCapture(source, backend)
+def hwaccel_params(hwaccel: str) -> List[int]:
+    """VideoCapture open params requesting ``hwaccel``; empty if this OpenCV predates them."""
+    prop = getattr(cv2, "CAP_PROP_HW_ACCELERATION", None)
+    mode = getattr(cv2, HWACCEL_MODES[hwaccel], None)
+    if prop is None or mode is None:
+        return []
+    return [prop, mode]
+
+
+def _report_progress(samples: Deque[Tuple[int, int]], frames_seen: int, frame_count: int) -> None:
+    # (monotonic_ns, frames_read) pairs; monotonic so NTP steps can't skew FPS.
+    samples.append((time.monotonic_ns(), frames_seen))
+    (start_ns, start_frames), (end_ns, end_frames) = samples[0], samples[-1]
+    fps = (end_frames - start_frames) * 1e9 / max(1, end_ns - start_ns)
+    print(f"[INFO] Captured {frames_seen}/{frame_count} frames (approx {fps:.1f} FPS).")
+
+
+def _capture_headless(reader: FrameReader, frame_count: int, samples: Deque[Tuple[int, int]]) -> None:
+    next_report = REPORT_EVERY
+    while reader.frames_read < frame_count:
+        reader.next_frame(timeout=0.5)
+        if reader.failed:
+            raise RuntimeError("Frame grab failed; stream may have dropped.")
+        frames_seen = reader.frames_read
+        if frames_seen >= next_report:
+            _report_progress(samples, frames_seen, frame_count)
+            next_report = frames_seen - frames_seen % REPORT_EVERY + REPORT_EVERY
+
+
+def _capture_display(reader: FrameReader, frame_count: int, samples: Deque[Tuple[int, int]]) -> None:
+    # Frames are counted as the reader decodes them, so slow rendering
+    # skips frames on screen instead of throttling the stream.
+    next_report = REPORT_EVERY
+    while reader.frames_read < frame_count:
+        frame = reader.next_frame(timeout=0.5)
+        if reader.failed:
+            raise RuntimeError("Frame grab failed; stream may have dropped.")
+        if frame is None:
+            continue
+
+        cv2.imshow("FLIR feed", frame)
+        key = cv2.waitKey(1) & 0xFF
+        if key in (27, ord("q")):  # ESC or q
+            print("User requested exit.")
+            return
+
+        frames_seen = reader.frames_read
+        if frames_seen >= next_report:
+            _report_progress(samples, frames_seen, frame_count)
+            next_report = frames_seen - frames_seen % REPORT_EVERY + REPORT_EVERY
+
+
+def run_capture(
+    source: Union[str, int],
+    frame_count: int,
+    timeout: float,
+    display: bool,
+    hwaccel: str = "auto",
+) -> None:
+    if isinstance(source, str) and source.startswith(("rtsp://", "http://", "https://")):
+        # Read by the FFmpeg backend when the capture is opened.
+        os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", FFMPEG_CAPTURE_OPTIONS)
+        params = hwaccel_params(hwaccel)
+        cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG, params) if params else cv2.VideoCapture(source, cv2.CAP_FFMPEG)
+    else:
+        cap = cv2.VideoCapture(source, cv2.CAP_ANY)
     if not cap.isOpened():
         raise RuntimeError(f"Unable to open stream '{source}'.")
+    # Don't let decoded frames queue up behind the reader.
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
+    reader = FrameReader(cap, max_frames=frame_count).start()
     try:
-        first_frame = wait_for_first_frame(cap, timeout)
+        first_frame = wait_for_first_frame(reader, timeout)
         if first_frame is None:
             raise TimeoutError(f"No frames received within {timeout:.1f}s.")
 
-        start_time = time.time()
-        frames_seen = 1
+        samples: Deque[Tuple[int, int]] = deque(
+            [(time.monotonic_ns(), reader.frames_read)], maxlen=FPS_WINDOW
+        )
 
         if display:
             cv2.imshow("FLIR feed", first_frame)
 
         print(f"[OK] Connected to {source}. Starting capture...")
 
-        while frames_seen < frame_count:
-            ok, frame = cap.read()
-            if not ok:
-                raise RuntimeError("Frame grab failed; stream may have dropped.")
-
-            frames_seen += 1
-            if display:
-                cv2.imshow("FLIR feed", frame)
-                key = cv2.waitKey(1) & 0xFF
-                if key in (27, ord("q")):  # ESC or q
-                    print("User requested exit.")
-                    break
-
-            if frames_seen % 30 == 0:
-                elapsed = time.time() - start_time + 1e-9
-                fps = frames_seen / elapsed
-                print(f"[INFO] Captured {frames_seen}/{frame_count} frames (approx {fps:.1f} FPS).")
-
-        print(f"[SUCCESS] Stream healthy. Frames read: {frames_seen}.")
+        # Picked once so the headless loop carries no display branches.
+        capture_loop = _capture_display if display else _capture_headless
+        capture_loop(reader, frame_count, samples)
+
+        print(f"[SUCCESS] Stream healthy. Frames read: {reader.frames_read}.")
     finally:
+        # Let an in-flight read finish before the capture is released under it.
+        reader.stop(timeout)
         cap.release()
         if display:
             cv2.destroyAllWindows()
@@ -154,7 +287,7 @@ def main() -> int:
     args = parse_args()
     try:
         source = resolve_source(args)
-        run_capture(source, args.frame_count, args.timeout, args.display)
+        run_capture(source, args.frame_count, args.timeout, args.display, args.hwaccel)
         return 0
     except KeyboardInterrupt:
         print("Interrupted by user.", file=sys.stderr)
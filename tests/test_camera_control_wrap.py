@@ -0,0 +1,55 @@
+"""Azimuth wrap-around of CameraControl's scalar and batched target helpers."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.classes.CameraControl import CameraControl  # noqa: E402  # pylint: disable=wrong-import-position
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 640, 480
+H_FOV, V_FOV = 20.0, 15.0
+# Camera azimuths a whole number of turns away from 0.
+AZIMUTHS = (-720.0, -360.0, 0.0, 360.0, 720.0)
+
+
+@pytest.fixture
+def cam():
+    return CameraControl()
+
+
+@pytest.mark.parametrize("camera_az", AZIMUTHS)
+@pytest.mark.parametrize("pixel_x, expected_az", [(SCREEN_WIDTH / 2, 0.0), (SCREEN_WIDTH, H_FOV / 2)])
+def test_scalar_wrap(cam, camera_az, pixel_x, expected_az):
+    az, el = cam.calculate_absolute_target_pos(
+        pixel_x, SCREEN_HEIGHT / 2, H_FOV, V_FOV, SCREEN_WIDTH, SCREEN_HEIGHT, camera_az, 5.0
+    )
+    assert 0.0 <= az < 360.0
+    assert az == pytest.approx(expected_az)
+    assert el == pytest.approx(5.0)
+
+
+@pytest.mark.parametrize("camera_az", AZIMUTHS)
+def test_vec_wrap_matches_scalar(cam, camera_az):
+    np = pytest.importorskip("numpy")
+    pixel_xs = [0.0, SCREEN_WIDTH / 2, SCREEN_WIDTH]
+    pixel_ys = [SCREEN_HEIGHT / 2] * 3
+    azs, els = cam.calculate_absolute_target_pos_vec(
+        pixel_xs, pixel_ys, H_FOV, V_FOV, SCREEN_WIDTH, SCREEN_HEIGHT, camera_az, 5.0
+    )
+    assert np.all((azs >= 0.0) & (azs < 360.0))
+    assert azs == pytest.approx([360.0 - H_FOV / 2, 0.0, H_FOV / 2])
+    expected = [
+        cam.calculate_absolute_target_pos(x, y, H_FOV, V_FOV, SCREEN_WIDTH, SCREEN_HEIGHT, camera_az, 5.0)
+        for x, y in zip(pixel_xs, pixel_ys)
+    ]
+    assert azs == pytest.approx([az for az, _ in expected])
+    assert els == pytest.approx([el for _, el in expected])
+
+
+def test_missing_position_returns_none(cam):
+    assert cam.calculate_absolute_target_pos(0, 0, H_FOV, V_FOV, SCREEN_WIDTH, SCREEN_HEIGHT, None, 0.0) == (None, None)
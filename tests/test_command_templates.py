@@ -0,0 +1,37 @@
+"""CameraControlAPI's per-command templates must build the same query as urlencode."""
+
+import sys
+from pathlib import Path
+from urllib.parse import urlencode
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.classes.CameraControlAPI import (  # noqa: E402  # pylint: disable=wrong-import-position
+    COMMAND_TEMPLATES,
+    _coerce_command_params,
+    build_command_suffix,
+)
+from src.constants import COMMAND_SPECS  # noqa: E402  # pylint: disable=wrong-import-position
+
+# Sample inputs per declared type, given as the callers pass them.
+SAMPLE_VALUES = {int: 7, float: 12.5, bool: "yes", str: "a b&c"}
+
+
+def _sample_params(command_name):
+    return {param.name: SAMPLE_VALUES.get(param.type, "1") for param in COMMAND_SPECS[command_name].params}
+
+
+def _urlencoded_suffix(command_name, params):
+    parsed_command, coerced = _coerce_command_params(command_name, params)
+    return "&" + urlencode({"action": parsed_command.action, **parsed_command.static_params, **coerced})
+
+
+@pytest.mark.parametrize("command_name", sorted(COMMAND_TEMPLATES))
+def test_template_matches_urlencode(command_name):
+    params = _sample_params(command_name)
+    assert build_command_suffix(command_name, params) == _urlencoded_suffix(command_name, params)
+